@@ -5,7 +5,7 @@ Main CLI entry point for gits-statuses.
 import argparse
 import sys
 
-from git_tools import GitScanner, TableFormatter
+from git_tools import CommitCountCache, GitScanner, TableFormatter
 from utils import (
     check_git_availability,
     print_error,
@@ -41,6 +41,24 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Show detailed information including remote URLs and total commits",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of repositories to inspect in parallel (default: 4 per CPU, up to 32)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recount the commits of every repository instead of using the cache",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Show partial results after this many seconds instead of waiting for slow repositories",
+    )
 
     return parser
 
@@ -49,6 +67,10 @@ def main() -> int:
     """Main entry point."""
     parser = create_parser()
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs <= 0:
+        parser.error("--jobs must be a positive number")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be a positive number of seconds")
 
     # Check if Git is available
     if not check_git_availability():
@@ -62,25 +84,44 @@ def main() -> int:
 
     try:
         # Scan for repositories
-        scanner = GitScanner(args.path)
+        # Commit counts are only displayed, and therefore only worth
+        # computing or loading from the cache, in the detailed view
+        cache = None
+        if args.detailed and not args.no_cache:
+            cache = CommitCountCache()
+        scanner = GitScanner(
+            args.path,
+            jobs=args.jobs,
+            cache=cache,
+            deadline=args.deadline,
+            count_commits=args.detailed,
+        )
         repositories = scanner.scan()
 
         # Sort repositories by name
         repositories.sort(key=lambda repo: repo.name.lower())
 
-        # Display results
-        print(f"\nFound {len(repositories)} Git repositories:\n")
-        table = TableFormatter.format_repositories(repositories, show_url=args.detailed)
-        print(table)
+        # Display results, written in one go rather than line by line
+        output = [
+            f"\nFound {len(repositories)} Git repositories:\n",
+            TableFormatter.format_repositories(repositories, show_url=args.detailed),
+        ]
 
         # Summary
         if repositories:
             stats = scanner.get_summary_stats()
-            summary = TableFormatter.format_summary(stats)
-            print(summary)
+            output.append(TableFormatter.format_summary(stats))
         else:
-            print("\nNo Git repositories found in the specified directory.")
+            output.append("\nNo Git repositories found in the specified directory.")
+
+        if args.deadline is not None and scanner.timed_out:
+            skipped = ", ".join(path.name for path in scanner.timed_out)
+            output.append(
+                f"\n{len(scanner.timed_out)} repositories not inspected within "
+                f"{args.deadline:g}s: {skipped}"
+            )
 
+        sys.stdout.write("\n".join(output) + "\n")
         return 0
 
     except KeyboardInterrupt:
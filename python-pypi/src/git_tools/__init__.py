@@ -1,5 +1,6 @@
 from .scanner import GitScanner
 from .repository import GitRepository
 from .formatter import TableFormatter
+from .cache import CommitCountCache
 
-__all__ = ["GitScanner", "GitRepository", "TableFormatter"]
+__all__ = ["GitScanner", "GitRepository", "TableFormatter", "CommitCountCache"]
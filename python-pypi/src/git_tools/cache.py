@@ -0,0 +1,95 @@
+"""
+Persistent cache for per-repository values that are expensive to compute.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def default_cache_path() -> Path:
+    """
+    Get the default location of the cache file.
+    Returns:
+        Path: The cache file, under $XDG_CACHE_HOME or ~/.cache.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "gits-statuses" / "cache.json"
+
+
+class CommitCountCache:
+    """
+    Remembers the total commit count of each repository for the commit it was
+    computed on. The count of a commit never changes, so an entry stays valid
+    until HEAD moves, and `git rev-list --count HEAD` - which walks the whole
+    history - only runs again when it does.
+    Attributes:
+        path (Path): The JSON file the cache is stored in.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Tuple[str, int]] = self._load()
+
+    def _load(self) -> Dict[str, Tuple[str, int]]:
+        """
+        Load the cache file, ignoring it if it is missing or unreadable.
+        Returns:
+            Dict[str, Tuple[str, int]]: The commit hash and count per repository.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                repo: (oid, count)
+                for repo, (oid, count) in data.items()
+                if isinstance(oid, str) and isinstance(count, int)
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def get(self, repo_path: Path, oid: str) -> Optional[int]:
+        """
+        Get the cached commit count of a repository.
+        Args:
+            repo_path (Path): The path to the repository.
+            oid (str): The commit HEAD currently points to.
+        Returns:
+            Optional[int]: The commit count, or None if it is not cached for oid.
+        """
+        entry = self._entries.get(str(repo_path))
+        if entry and entry[0] == oid:
+            return entry[1]
+        return None
+
+    def set(self, repo_path: Path, oid: str, count: int) -> None:
+        """
+        Store the commit count of a repository.
+        Args:
+            repo_path (Path): The path to the repository.
+            oid (str): The commit the count was computed on.
+            count (int): The commit count.
+        """
+        with self._lock:
+            if self._entries.get(str(repo_path)) != (oid, count):
+                self._entries[str(repo_path)] = (oid, count)
+                self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError:
+                pass
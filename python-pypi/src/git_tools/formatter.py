@@ -32,83 +32,53 @@ class TableFormatter:
             if not display_repositories:
                 return "No Git repositories with changes found. Use --detailed to see all repositories."
 
-        # Calculate column widths based on repositories to display
-        max_name_width = max(len(repo.name) for repo in display_repositories)
-        max_branch_width = max(len(repo.branch) for repo in display_repositories)
-        max_ahead_width = max(
-            len(str(repo.ahead_count)) if repo.ahead_count > 0 else 0
-            for repo in display_repositories
-        )
-        max_ahead_width = max(max_ahead_width, len("Ahead"))
-        max_behind_width = max(
-            len(str(repo.behind_count)) if repo.behind_count > 0 else 0
-            for repo in display_repositories
-        )
-        max_behind_width = max(max_behind_width, len("Behind"))
-        max_changed_width = max(
-            len(str(repo.changed_count)) if repo.changed_count > 0 else 0
-            for repo in display_repositories
-        )
-        max_changed_width = max(max_changed_width, len("Changed"))
-        max_untracked_width = max(
-            len(str(repo.untracked_count)) if repo.untracked_count > 0 else 0
-            for repo in display_repositories
-        )
-        max_untracked_width = max(max_untracked_width, len("Untracked"))
-
-        # Ensure minimum widths
-        name_width = max(max_name_width, len("Repository"))
-        branch_width = max(max_branch_width, len("Branch"))
-        ahead_width = max(max_ahead_width, len("Ahead"))
-        behind_width = max(max_behind_width, len("Behind"))
-        changed_width = max(max_changed_width, len("Changed"))
-        untracked_width = max(max_untracked_width, len("Untracked"))
-
+        headers = ["Repository", "Branch", "Ahead", "Behind", "Changed", "Untracked"]
         if show_url:
-            max_rev_width = max(len(repo.rev) for repo in display_repositories)
-            rev_width = max(max_rev_width, len("Commit"))
-            max_url_width = max(len(repo.remote_url) for repo in display_repositories)
-            url_width = max(max_url_width, len("Remote URL"))
-            max_commits_width = max(
-                len(str(repo.total_commits)) for repo in display_repositories
-            )
-            commits_width = max(max_commits_width, len("Total Commits"))
-            max_status_width = max(len(repo.status) for repo in display_repositories)
-            status_width = max(max_status_width, len("Status"))
-
-            # Create header with URL
-            header = f"{'Repository':<{name_width}} | {'Branch':<{branch_width}} | {'Commit':<{rev_width}} | {'Ahead':<{ahead_width}} | {'Behind':<{behind_width}} | {'Changed':<{changed_width}} | {'Untracked':<{untracked_width}} | {'Total Commits':<{commits_width}} | {'Status':<{status_width}} | {'Remote URL':<{url_width}}"
-            separator = "-" * len(header)
+            headers[2:2] = ["Commit"]
+            headers += ["Total Commits", "Status", "Remote URL"]
 
-            # Create rows with URL
-            rows = []
-            for repo in display_repositories:
-                ahead_str = str(repo.ahead_count) if repo.ahead_count > 0 else ""
-                behind_str = str(repo.behind_count) if repo.behind_count > 0 else ""
-                changed_str = str(repo.changed_count) if repo.changed_count > 0 else ""
-                untracked_str = (
-                    str(repo.untracked_count) if repo.untracked_count > 0 else ""
+        # Render every cell once while measuring the columns in the same pass
+        widths = [len(header) for header in headers]
+        rows = []
+        for repo in display_repositories:
+            ahead_str = str(repo.ahead_count) if repo.ahead_count > 0 else ""
+            behind_str = str(repo.behind_count) if repo.behind_count > 0 else ""
+            changed_str = str(repo.changed_count) if repo.changed_count > 0 else ""
+            untracked_str = (
+                str(repo.untracked_count) if repo.untracked_count > 0 else ""
+            )
+            if show_url:
+                cells = (
+                    repo.name,
+                    repo.branch,
+                    repo.rev,
+                    ahead_str,
+                    behind_str,
+                    changed_str,
+                    untracked_str,
+                    str(repo.total_commits),
+                    repo.status,
+                    repo.remote_url,
                 )
-                row = f"{repo.name:<{name_width}} | {repo.branch:<{branch_width}} | {repo.rev:<{rev_width}} | {ahead_str:<{ahead_width}} | {behind_str:<{behind_width}} | {changed_str:<{changed_width}} | {untracked_str:<{untracked_width}} | {repo.total_commits:<{commits_width}} | {repo.status:<{status_width}} | {repo.remote_url:<{url_width}}"
-                rows.append(row)
-        else:
-            # Create header without URL
-            header = f"{'Repository':<{name_width}} | {'Branch':<{branch_width}} | {'Ahead':<{ahead_width}} | {'Behind':<{behind_width}} | {'Changed':<{changed_width}} | {'Untracked':<{untracked_width}}"
-            separator = "-" * len(header)
-
-            # Create rows without URL (only for active repositories)
-            rows = []
-            for repo in display_repositories:
-                ahead_str = str(repo.ahead_count) if repo.ahead_count > 0 else ""
-                behind_str = str(repo.behind_count) if repo.behind_count > 0 else ""
-                changed_str = str(repo.changed_count) if repo.changed_count > 0 else ""
-                untracked_str = (
-                    str(repo.untracked_count) if repo.untracked_count > 0 else ""
+            else:
+                cells = (
+                    repo.name,
+                    repo.branch,
+                    ahead_str,
+                    behind_str,
+                    changed_str,
+                    untracked_str,
                 )
-                row = f"{repo.name:<{name_width}} | {repo.branch:<{branch_width}} | {ahead_str:<{ahead_width}} | {behind_str:<{behind_width}} | {changed_str:<{changed_width}} | {untracked_str:<{untracked_width}}"
-                rows.append(row)
+            for column, cell in enumerate(cells):
+                if len(cell) > widths[column]:
+                    widths[column] = len(cell)
+            rows.append(cells)
 
-        return "\n".join([header, separator] + rows)
+        header = " | ".join(map(str.ljust, headers, widths))
+        separator = "-" * len(header)
+        lines = [header, separator]
+        lines += [" | ".join(map(str.ljust, cells, widths)) for cells in rows]
+        return "\n".join(lines)
 
     @staticmethod
     def format_summary(stats: dict) -> str:
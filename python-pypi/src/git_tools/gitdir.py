@@ -0,0 +1,179 @@
+"""
+Helpers that read repository metadata straight from the .git directory.
+"""
+
+import configparser
+from pathlib import Path
+from typing import Optional
+
+
+def resolve_git_dir(path: Path) -> Path:
+    """
+    Locate the git directory of a working tree.
+    Args:
+        path (Path): The root of the working tree.
+    Returns:
+        Path: The git directory. For worktrees and submodules `.git` is a file
+        pointing to the real location.
+    Raises:
+        OSError: If the git directory cannot be read.
+        ValueError: If `.git` is a file without a `gitdir:` line.
+    """
+    dot_git = path / ".git"
+    if dot_git.is_dir():
+        return dot_git
+
+    content = dot_git.read_text(encoding="utf-8").strip()
+    if not content.startswith("gitdir:"):
+        raise ValueError(f"Unrecognized .git file in {path}")
+    return path / content[len("gitdir:") :].strip()
+
+
+def resolve_common_dir(git_dir: Path) -> Path:
+    """
+    Get the directory holding the config and refs shared by all worktrees.
+    Args:
+        git_dir (Path): The git directory of the working tree.
+    Returns:
+        Path: The common git directory.
+    """
+    try:
+        common = (git_dir / "commondir").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return git_dir
+    return git_dir / common
+
+
+def read_remote_url(path: Path) -> Optional[str]:
+    """
+    Read the `remote.origin.url` setting from the repository config file.
+    Args:
+        path (Path): The root of the working tree.
+    Returns:
+        Optional[str]: The remote origin URL, or None if it is not set.
+    Raises:
+        OSError: If the config file cannot be read.
+        ValueError: If the config cannot be interpreted without git, e.g. it
+        uses includes or per-worktree configuration.
+    """
+    git_dir = resolve_git_dir(path)
+    config_text = (resolve_common_dir(git_dir) / "config").read_text(encoding="utf-8")
+
+    parser = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        parser.read_string(config_text)
+    except configparser.Error as e:
+        raise ValueError(str(e)) from e
+
+    urls = []
+    for section in parser.sections():
+        name = section.lower()
+        if name.startswith("include") or (
+            name == "extensions"
+            and parser[section].get("worktreeconfig", "").lower() == "true"
+        ):
+            raise ValueError("Config depends on files git has to resolve")
+        # The section name is case-insensitive, the subsection name is not,
+        # except in the deprecated [remote.origin] form
+        kind, _, subsection = section.partition(" ")
+        is_origin = kind.lower() == "remote" and subsection == '"origin"'
+        if (is_origin or name == "remote.origin") and parser.has_option(section, "url"):
+            urls.append(parser.get(section, "url"))
+
+    if not urls:
+        return None
+    if len(urls) > 1:
+        raise ValueError("remote.origin.url is set in several sections")
+    return _unquote(urls[0])
+
+
+def _unquote(value: str) -> str:
+    """
+    Decode a raw config value that needs none of git's escaping rules.
+    Args:
+        value (str): The value as written after `=` in the config file.
+    Returns:
+        str: The value, without the double quotes around it, if any.
+    Raises:
+        ValueError: If the value spans several lines, or holds a backslash
+        escape, a quote other than the pair around the whole value, or an
+        unquoted `;` or `#` (a comment for git, even without whitespace before
+        it).
+    """
+    value = value.strip()
+    # configparser joins a line indented deeper than the key before it onto
+    # that key's value, e.g. a tab-indented fetch after a space-indented url;
+    # git reads it as a key of its own
+    if "\n" in value:
+        raise ValueError(f"Config value spans several lines: {value!r}")
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+        special = '\\"'
+    else:
+        special = '\\";#'
+    if any(char in value for char in special):
+        raise ValueError(f"Config value needs git to decode: {value!r}")
+    return value
+
+
+def is_shallow(path: Path) -> bool:
+    """
+    Check whether a working tree belongs to a shallow clone, whose history
+    can grow without HEAD moving, e.g. through `git fetch --unshallow`.
+    Args:
+        path (Path): The root of the working tree.
+    Returns:
+        bool: True if the repository is shallow, False otherwise.
+    Raises:
+        OSError: If the git directory cannot be read.
+        ValueError: If `.git` is a file without a `gitdir:` line.
+    """
+    return (resolve_common_dir(resolve_git_dir(path)) / "shallow").exists()
+
+
+def read_head_oid(path: Path) -> str:
+    """
+    Resolve the commit checked out in a working tree from HEAD and the refs.
+    Args:
+        path (Path): The root of the working tree.
+    Returns:
+        str: The commit hash HEAD points to.
+    Raises:
+        OSError: If HEAD or the ref it points to cannot be read.
+        ValueError: If HEAD does not resolve to a commit hash, e.g. on an unborn
+        branch or with a ref storage format other than files.
+    """
+    git_dir = resolve_git_dir(path)
+    head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    if not head.startswith("ref:"):
+        return _validate_oid(head)
+
+    ref = head[len("ref:") :].strip()
+    common_dir = resolve_common_dir(git_dir)
+    try:
+        return _validate_oid((common_dir / ref).read_text(encoding="utf-8").strip())
+    except FileNotFoundError:
+        pass
+
+    # Refs that are not loose live in packed-refs as "<oid> <refname>" lines
+    with open(common_dir / "packed-refs", encoding="utf-8") as packed_refs:
+        for line in packed_refs:
+            oid, _, name = line.rstrip("\n").partition(" ")
+            if name == ref:
+                return _validate_oid(oid)
+    raise ValueError(f"{ref} not found")
+
+
+def _validate_oid(value: str) -> str:
+    """
+    Check that a value read from a ref file is a commit hash.
+    Args:
+        value (str): The value to check.
+    Returns:
+        str: The commit hash.
+    Raises:
+        ValueError: If the value is not a hexadecimal object name.
+    """
+    if len(value) not in (40, 64) or value.strip("0123456789abcdef"):
+        raise ValueError(f"Not an object name: {value!r}")
+    return value
@@ -0,0 +1,66 @@
+"""
+Git process tracking module.
+"""
+
+import subprocess
+import threading
+from typing import Set
+
+
+class ProcessGroup:
+    """
+    The git processes running on behalf of a scan, so that they can all be
+    killed at once when the scan runs out of time.
+    Attributes:
+        killed (bool): Whether kill() was called; processes added afterwards
+            are killed straight away.
+    """
+
+    def __init__(self):
+        self.killed = False
+        self._processes: Set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    def add(self, proc: subprocess.Popen) -> None:
+        """
+        Track a running process.
+        Args:
+            proc (subprocess.Popen): The process to track.
+        """
+        with self._lock:
+            if not self.killed:
+                self._processes.add(proc)
+                return
+        self._kill(proc)
+
+    def discard(self, proc: subprocess.Popen) -> None:
+        """
+        Stop tracking a process, once it has been waited for.
+        Args:
+            proc (subprocess.Popen): The process to forget.
+        """
+        with self._lock:
+            self._processes.discard(proc)
+
+    def kill(self) -> None:
+        """
+        Kill every tracked process and any process added later, so that the
+        threads waiting on them return at once.
+        """
+        with self._lock:
+            self.killed = True
+            processes, self._processes = self._processes, set()
+        for proc in processes:
+            self._kill(proc)
+
+    @staticmethod
+    def _kill(proc: subprocess.Popen) -> None:
+        """
+        Kill a process, ignoring one that has already exited.
+        Args:
+            proc (subprocess.Popen): The process to kill.
+        """
+        try:
+            proc.kill()
+        except OSError:
+            pass
@@ -2,8 +2,35 @@
 Git repository information extraction module.
 """
 
+import os
 import subprocess
+from functools import cached_property
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from git_tools.cache import CommitCountCache
+from git_tools.gitdir import is_shallow, read_head_oid, read_remote_url
+from git_tools.processes import ProcessGroup
+from utils.validation import GIT
+
+# Every query only reads the repository, so git need not take optional locks
+# such as index.lock, which would serialize it with any other git process
+# working on the same repository. On Windows, the index is also read in
+# parallel and the filesystem cache is enabled.
+_GIT_OPTIONS = ("--no-optional-locks",)
+if os.name == "nt":
+    _GIT_OPTIONS += ("-c", "core.preloadindex=true", "-c", "core.fscache=true")
+
+# close_fds=False lets CPython start git with posix_spawn(). On Windows there is
+# no such fast path, and children would inherit every pipe handle another
+# thread has made inheritable while starting its own git, so one repository's
+# git could hold another's pipe open; hence close_fds stays on there.
+_CLOSE_FDS = os.name == "nt"
+
+# The git arguments of every query, built once rather than on each call
+_STATUS_ARGS = ("status", "--porcelain=v2", "--branch", "-z")
+_COUNT_COMMITS_ARGS = ("rev-list", "--count", "HEAD")
+_REMOTE_URL_ARGS = ("config", "--get", "remote.origin.url")
 
 
 class GitRepository:
@@ -14,6 +41,7 @@ class GitRepository:
         name (str): The name of the repository.
         is_valid (bool): Whether the repository is valid.
         branch (str): The current branch of the repository.
+        rev (str): The commit hash checked out in the repository.
         remote_url (str): The remote URL of the repository.
         ahead_count (int): The number of commits ahead of the remote.
         behind_count (int): The number of commits behind the remote.
@@ -21,22 +49,25 @@ class GitRepository:
         untracked_count (int): The number of untracked files.
         total_commits (int): The total number of commits in the repository.
         status (str): The summary of the repository status.
+        processes (Optional[ProcessGroup]): The group every git process started
+            for the repository is added to, if any.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        cache: Optional[CommitCountCache] = None,
+        count_commits: bool = False,
+        processes: Optional[ProcessGroup] = None,
+    ):
         self.path = Path(path)
         self.name = self.path.name
-        self.is_valid = self._is_git_repository()
+        self.cache = cache
+        self.count_commits = count_commits
+        self.processes = processes
+        self.is_valid = self.collect(self.spawn_all())
 
         if self.is_valid:
-            self.branch = self._get_current_branch()
-            self.rev = self._get_current_revision()
-            self.remote_url = self._get_remote_url()
-            self.ahead_count = self._get_ahead_count()
-            self.behind_count = self._get_behind_count()
-            self.changed_count = self._get_changed_count()
-            self.untracked_count = self._get_untracked_count()
-            self.total_commits = self._get_total_commits()
             self.status = self._get_status_summary()
         else:
             self.branch = "Unknown"
@@ -49,270 +80,301 @@ class GitRepository:
             self.total_commits = 0
             self.status = "Invalid"
 
-    def _is_git_repository(self) -> bool:
+    def spawn_all(self) -> Dict[str, subprocess.Popen]:
         """
-        Check if the directory is a valid Git repository.
+        Start every git query needed for this repository without waiting for
+        any of them, so that they run concurrently. The commits are only
+        counted up front when count_commits is set.
         Returns:
-            bool: True if the directory is a valid Git repository, False otherwise.
+            Dict[str, subprocess.Popen]: The running processes, keyed by query.
         """
+        handles = {}
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--is-inside-work-tree"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            return result.returncode == 0 and result.stdout.strip() == "true"
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-        ):
+            handles["status"] = self._spawn(_STATUS_ARGS)
+            if self.count_commits:
+                cached_commits = self._get_cached_total_commits()
+                if cached_commits is None:
+                    handles["total_commits"] = self._spawn(_COUNT_COMMITS_ARGS)
+                else:
+                    self.total_commits = cached_commits
+        except (subprocess.SubprocessError, OSError):
+            pass
+        return handles
+
+    def collect(self, handles: Dict[str, subprocess.Popen]) -> bool:
+        """
+        Wait for the processes started by spawn_all and parse their output.
+        Args:
+            handles (Dict[str, subprocess.Popen]): The processes returned by spawn_all.
+        Returns:
+            bool: True if the directory is a valid Git repository, False otherwise.
+        """
+        outputs = {query: self._communicate(proc) for query, proc in handles.items()}
+
+        status = outputs.get("status")
+        if status is None:
             return False
+        self._parse_status(status)
+
+        if "total_commits" in handles:
+            self.total_commits = self._parse_total_commits(outputs["total_commits"])
+
+        return True
 
-    def _get_current_revision(self) -> str:
+    def _parse_total_commits(self, output: Optional[bytes]) -> int:
         """
-        Get the current commit hash.
+        Parse the output of `git rev-list --count HEAD` and remember it in the
+        cache, if any.
+        Args:
+            output (Optional[bytes]): The raw output, or None if the command failed.
         Returns:
-            str: The current commit hash.
+            int: The total number of commits, 0 if they could not be counted.
         """
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and (rev := result.stdout.strip()):
-                return rev
-            return "Unknown"
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-        ):
-            return "Unknown"
+            total_commits = int(output or 0)
+        except ValueError:
+            return 0
+        if output is not None and self.rev != "Unknown" and self._uses_cache:
+            self.cache.set(self.path.resolve(), self.rev, total_commits)
+        return total_commits
 
-    def _get_current_branch(self) -> str:
+    def _get_cached_total_commits(self) -> Optional[int]:
         """
-        Get the current branch name.
+        Look up the commit count of the checked-out commit in the cache.
         Returns:
-            str: The current branch name.
+            Optional[int]: The cached commit count, or None on a cache miss.
         """
+        if not self._uses_cache:
+            return None
         try:
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                branch = result.stdout.strip()
-                return branch if branch else "HEAD detached"
-            return "Unknown"
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-        ):
-            return "Unknown"
+            oid = read_head_oid(self.path)
+        except (OSError, ValueError):
+            return None
+        return self.cache.get(self.path.resolve(), oid)
 
-    def _get_remote_url(self) -> str:
+    @cached_property
+    def _uses_cache(self) -> bool:
         """
-        Get the remote origin URL.
+        Whether commit counts of this repository go through the cache. Counts
+        are keyed by the HEAD commit, which does not change when a shallow
+        clone gains history, so shallow clones are always counted afresh.
         Returns:
-            str: The remote origin URL.
+            bool: True if there is a cache and the repository is not shallow.
         """
+        if self.cache is None:
+            return False
         try:
-            result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-            return "No remote"
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-        ):
-            return "No remote"
+            return not is_shallow(self.path)
+        except (OSError, ValueError):
+            return False
 
-    def _get_ahead_count(self) -> int:
+    @cached_property
+    def _git_prefix(self) -> Tuple[str, ...]:
         """
-        Get the number of commits ahead of remote.
+        The start of the command line of every git command run in the repository.
         Returns:
-            int: The number of commits ahead of remote.
+            Tuple[str, ...]: The git executable and its global options.
         """
-        try:
-            # First check if we have a remote tracking branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "@{u}"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode != 0:
-                return 0  # No upstream branch
-
-            upstream = result.stdout.strip()
-
-            # Get the count of commits ahead
-            result = subprocess.run(
-                ["git", "rev-list", "--count", f"{upstream}..HEAD"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                return int(result.stdout.strip())
-            return 0
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-            ValueError,
-        ):
-            return 0
+        # The repository is passed with -C rather than as the working directory
+        # because CPython only starts children with posix_spawn() - a single
+        # syscall instead of fork() plus exec() - when cwd is None, close_fds
+        # is False and the executable is an absolute path (see GIT).
+        return (GIT, *_GIT_OPTIONS, "-C", str(self.path))
 
-    def _get_behind_count(self) -> int:
+    def _spawn(self, args: Tuple[str, ...]) -> subprocess.Popen:
         """
-        Get the number of commits behind remote.
+        Start a git command in the repository without waiting for it.
+        Args:
+            args (Tuple[str, ...]): The git subcommand and its arguments.
         Returns:
-            int: The number of commits behind remote.
+            subprocess.Popen: The running process.
         """
-        try:
-            # First check if we have a remote tracking branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "@{u}"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode != 0:
-                return 0  # No upstream branch
-
-            upstream = result.stdout.strip()
-
-            # Get the count of commits behind
-            result = subprocess.run(
-                ["git", "rev-list", "--count", f"HEAD..{upstream}"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                return int(result.stdout.strip())
-            return 0
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-            ValueError,
-        ):
-            return 0
+        # close_fds=False skips closing every descriptor in the child on POSIX.
+        # git is trusted, and the descriptors Python opens are non-inheritable
+        # by default (PEP 446), so the child still only receives its stdio.
+        # See _CLOSE_FDS for why Windows keeps close_fds on.
+        proc = subprocess.Popen(
+            self._git_prefix + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=_CLOSE_FDS,
+        )
+        if self.processes is not None:
+            self.processes.add(proc)
+        return proc
+
+    def _git(self, args: Tuple[str, ...]) -> subprocess.CompletedProcess:
+        """
+        Run a git command in the repository and wait for it.
+        Args:
+            args (Tuple[str, ...]): The git subcommand and its arguments.
+        Returns:
+            subprocess.CompletedProcess: The finished process.
+        """
+        return subprocess.run(
+            self._git_prefix + args,
+            capture_output=True,
+            timeout=5,
+            close_fds=_CLOSE_FDS,
+        )
 
-    def _get_changed_count(self) -> int:
+    def _communicate(self, proc: subprocess.Popen) -> Optional[bytes]:
         """
-        Get the number of changed files (includes all files from git status --porcelain).
+        Wait for a git command and return its output.
+        Args:
+            proc (subprocess.Popen): The running process.
         Returns:
-            int: The number of changed files.
+            Optional[bytes]: The raw output of the command, or None if it failed.
         """
         try:
-            # Get git status porcelain output
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                if not lines or lines == [""]:
-                    return 0
+            stdout, _ = proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            return None
+        finally:
+            if self.processes is not None:
+                self.processes.discard(proc)
+        if proc.returncode != 0:
+            return None
+        return stdout
 
-                # Count all files (PowerShell approach - includes untracked files)
-                return len(lines)
-            return 0
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-            ValueError,
-        ):
-            return 0
+    def _parse_status(self, output: bytes) -> None:
+        """
+        Parse branch, revision, ahead/behind and file counts from the output of
+        `git status --porcelain=v2 --branch -z`.
+        Args:
+            output (bytes): The raw output of git status. Only the branch name
+                and commit are decoded, since they are the only values displayed.
+        """
+        self.branch = "Unknown"
+        self.rev = "Unknown"
+        self.ahead_count = 0
+        self.behind_count = 0
+        self.changed_count = 0
+        self.untracked_count = 0
 
-    def _get_untracked_count(self) -> int:
+        # The branch headers come first, one "# key value" record each
+        body_start = 0
+        while output.startswith(b"# ", body_start):
+            line_end = output.find(b"\x00", body_start)
+            if line_end == -1:
+                line_end = len(output)
+            key, _, value = output[body_start + 2 : line_end].partition(b" ")
+            body_start = line_end + 1
+
+            if key == b"branch.oid":
+                if value != b"(initial)":
+                    self.rev = value.decode("ascii", "replace")
+            elif key == b"branch.head":
+                if value == b"(detached)":
+                    self.branch = "HEAD detached"
+                else:
+                    self.branch = value.decode("utf-8", "replace")
+            elif key == b"branch.ab":
+                # Only the checked-out branch is reported. Should every local
+                # branch ever be needed, one `git for-each-ref --format=
+                # '%(refname:short) %(ahead-behind:<ref>)' refs/heads/` call
+                # (git >= 2.41) yields them all in a single process.
+                ahead, _, behind = value.partition(b" ")
+                try:
+                    self.ahead_count = int(ahead)
+                    self.behind_count = -int(behind)
+                except ValueError:
+                    pass
+
+        # Every remaining NUL-terminated record is one entry, so count them in
+        # C rather than looping over them. Count all files (PowerShell
+        # approach - includes untracked files); untracked entries start with
+        # "? ". Renames and copies ("2 ") carry their original path as an extra
+        # record, so only then are the records walked one by one.
+        body = output[body_start:]
+        if body.startswith(b"2 ") or b"\x002 " in body:
+            self.changed_count, self.untracked_count = self._count_entries(body)
+        else:
+            self.changed_count = body.count(b"\x00")
+            self.untracked_count = body.count(b"\x00? ") + body.startswith(b"? ")
+
+    @staticmethod
+    def _count_entries(body: bytes) -> Tuple[int, int]:
         """
-        Get the number of untracked files.
+        Count the entries of a `git status --porcelain=v2 -z` body that
+        contains renames or copies.
+        Args:
+            body (bytes): The status records following the branch headers.
         Returns:
-            int: The number of untracked files.
+            Tuple[int, int]: The number of entries and of untracked entries.
         """
-        try:
-            # Get git status porcelain output
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                if not lines or lines == [""]:
-                    return 0
+        entries = 0
+        untracked = 0
+        records = iter(body.split(b"\x00"))
+        for record in records:
+            if not record:
+                continue
+            entries += 1
+            if record[:2] == b"? ":
+                untracked += 1
+            elif record[:2] == b"2 ":
+                next(records, None)  # original path of the rename/copy
+        return entries, untracked
 
-                # Count untracked files
-                untracked_count = 0
-                for line in lines:
-                    if len(line) >= 2 and line[:2] == "??":
-                        untracked_count += 1
+    @cached_property
+    def total_commits(self) -> int:
+        """
+        The total number of commits, only counted when first needed unless the
+        repository was inspected with count_commits.
+        Returns:
+            int: The total number of commits in the repository.
+        """
+        return self._count_total_commits()
 
-                return untracked_count
-            return 0
-        except (
-            subprocess.TimeoutExpired,
-            subprocess.SubprocessError,
-            FileNotFoundError,
-            ValueError,
-        ):
+    def _count_total_commits(self) -> int:
+        """
+        Count the commits reachable from HEAD, using the cache when possible.
+        Returns:
+            int: The total number of commits, 0 if they could not be counted.
+        """
+        cached_commits = self._get_cached_total_commits()
+        if cached_commits is not None:
+            return cached_commits
+        try:
+            proc = self._spawn(_COUNT_COMMITS_ARGS)
+        except (subprocess.SubprocessError, OSError):
             return 0
+        return self._parse_total_commits(self._communicate(proc))
 
-    def _get_total_commits(self) -> int:
+    @cached_property
+    def remote_url(self) -> str:
         """
-        Get the total number of commits in the repository.
+        The remote origin URL, only looked up when first needed.
         Returns:
-            int: The total number of commits in the repository.
+            str: The remote origin URL.
+        """
+        return self._get_remote_url()
+
+    def _get_remote_url(self) -> str:
+        """
+        Get the remote origin URL, reading .git/config directly and only asking
+        git when the file cannot be interpreted on its own.
+        Returns:
+            str: The remote origin URL.
         """
         try:
-            result = subprocess.run(
-                ["git", "rev-list", "--count", "HEAD"],
-                cwd=self.path,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            return read_remote_url(self.path) or "No remote"
+        except (OSError, ValueError):
+            pass
+
+        try:
+            result = self._git(_REMOTE_URL_ARGS)
             if result.returncode == 0:
-                return int(result.stdout.strip())
-            return 0
+                return result.stdout.strip().decode("utf-8", "replace")
+            return "No remote"
         except (
             subprocess.TimeoutExpired,
             subprocess.SubprocessError,
             FileNotFoundError,
-            ValueError,
         ):
-            return 0
+            return "No remote"
 
     def _get_status_summary(self) -> str:
         """
@@ -2,11 +2,22 @@
 Git repository scanner module.
 """
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Union
 
+from git_tools.cache import CommitCountCache
+from git_tools.processes import ProcessGroup
 from git_tools.repository import GitRepository
 
+# Each GitRepository spends nearly all of its time waiting on git subprocesses,
+# so a pool several times larger than the core count keeps the CPUs busy.
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+
 
 class GitScanner:
     """
@@ -14,11 +25,31 @@ class GitScanner:
     Attributes:
         scan_path (Path): The path to scan for Git repositories.
         repositories (List[GitRepository]): The list of Git repositories found.
+        jobs (int): The number of repositories inspected in parallel.
+        cache (Optional[CommitCountCache]): The commit count cache, if any.
+        deadline (Optional[float]): The seconds a scan may take, if limited.
+        count_commits (bool): Whether to count the commits of every repository
+            during the scan rather than on first access.
+        timed_out (List[Path]): The candidates not inspected before the deadline.
+        processes (ProcessGroup): The git processes started by the scan.
     """
 
-    def __init__(self, scan_path: str = "."):
+    def __init__(
+        self,
+        scan_path: str = ".",
+        jobs: Optional[int] = None,
+        cache: Optional[CommitCountCache] = None,
+        deadline: Optional[float] = None,
+        count_commits: bool = False,
+    ):
         self.scan_path = Path(scan_path).resolve()
         self.repositories: List[GitRepository] = []
+        self.jobs = jobs if jobs and jobs > 0 else DEFAULT_JOBS
+        self.cache = cache
+        self.deadline = deadline
+        self.count_commits = count_commits
+        self.timed_out: List[Path] = []
+        self.processes = ProcessGroup()
 
     def scan(self) -> List[GitRepository]:
         """
@@ -27,35 +58,73 @@ class GitScanner:
             List[GitRepository]: The list of Git repositories found.
         """
         print(f"Scanning for Git repositories in: {self.scan_path}")
+        if self.deadline is not None:
+            deadline_at = time.monotonic() + self.deadline
 
         # Check if the scan path itself is a Git repository
+        candidates = []
         if self._is_directory_git_repo(self.scan_path):
-            repo = GitRepository(str(self.scan_path))
-            if repo.is_valid:
-                self.repositories.append(repo)
+            candidates.append(str(self.scan_path))
 
-        # Scan subdirectories
+        # Scan subdirectories. DirEntry knows each entry's type from the
+        # directory listing itself, so only symlinks cost an extra stat.
         try:
-            for item in self.scan_path.iterdir():
-                if item.is_dir() and not item.name.startswith("."):
-                    if self._is_directory_git_repo(item):
-                        repo = GitRepository(str(item))
-                        if repo.is_valid:
-                            self.repositories.append(repo)
+            with os.scandir(self.scan_path) as entries:
+                for entry in entries:
+                    if entry.name[:1] != "." and entry.is_dir():
+                        if self._is_directory_git_repo(entry.path):
+                            candidates.append(entry.path)
         except PermissionError:
             print(f"Permission denied accessing: {self.scan_path}")
 
+        # Inspect the candidates in parallel; every repository runs git in its
+        # own working directory, so the workers share no state.
+        if candidates:
+            inspect = partial(
+                GitRepository,
+                cache=self.cache,
+                count_commits=self.count_commits,
+                processes=self.processes,
+            )
+            executor = ThreadPoolExecutor(max_workers=self.jobs)
+            try:
+                futures = [executor.submit(inspect, path) for path in candidates]
+                for path, future in zip(candidates, futures):
+                    try:
+                        timeout = None
+                        if self.deadline is not None:
+                            timeout = max(0.0, deadline_at - time.monotonic())
+                        repo = future.result(timeout=timeout)
+                    except FutureTimeoutError:
+                        future.cancel()
+                        self.timed_out.append(Path(path))
+                        continue
+                    if repo.is_valid:
+                        self.repositories.append(repo)
+            finally:
+                # Queued repositories were cancelled above. Running ones are
+                # still waiting on git, and the interpreter joins the pool's
+                # threads before exiting, so kill their processes to let them
+                # return now rather than after the per-call timeout.
+                if self.timed_out:
+                    self.processes.kill()
+                executor.shutdown(wait=not self.timed_out)
+            if self.cache is not None:
+                self.cache.save()
+
         return self.repositories
 
-    def _is_directory_git_repo(self, path: Path) -> bool:
+    def _is_directory_git_repo(self, path: Union[Path, str]) -> bool:
         """
         Quick check if directory contains a .git folder.
         Args:
-            path (Path): The path to check.
+            path (Union[Path, str]): The path to check.
         Returns:
             bool: True if the directory contains a .git folder, False otherwise.
         """
-        return (path / ".git").exists()
+        # lstat() the entry itself: a .git file or symlink is enough to make
+        # the directory a candidate, and GitRepository validates it anyway
+        return os.path.lexists(os.path.join(path, ".git"))
 
     def get_repositories_with_changes(self) -> List[GitRepository]:
         """
@@ -1,19 +1,31 @@
-import subprocess
+import os
+import shutil
 import sys
 from pathlib import Path
 
 
+def _find_git() -> str:
+    """
+    Locate the git executable.
+    Returns:
+        str: The absolute path to git, or "git" if it is not on PATH.
+    """
+    found = shutil.which("git")
+    # which() keeps the result relative for a relative PATH entry
+    return os.path.abspath(found) if found else "git"
+
+
+# Resolved once so that every git invocation skips the PATH lookup
+GIT = _find_git()
+
+
 def check_git_availability() -> bool:
     """
     Check if Git is available in the system.
     Returns:
         bool: True if Git is available, False otherwise.
     """
-    try:
-        subprocess.run(["git", "--version"], capture_output=True, check=True)
-        return True
-    except (subprocess.SubprocessError, FileNotFoundError):
-        return False
+    return os.path.isabs(GIT) and os.access(GIT, os.X_OK)
 
 
 def validate_path(path_str: str) -> Path:
@@ -2,153 +2,240 @@
 Pytest configuration and fixtures for gits-statuses tests.
 """
 
+import itertools
+import os
+import re
+import shutil
+import subprocess
 import pytest
-from unittest.mock import Mock, patch
+from dataclasses import dataclass
+from unittest.mock import Mock
 import sys
 
-from src.git_tools import GitRepository, GitScanner
+from pathlib import Path
 
+from src.git_tools import GitRepository
 
-@pytest.fixture
+
+# Frozen so that the session-scoped instances below can be shared safely; use
+# dataclasses.replace() to derive a variant. No slots=True: Python 3.8 support.
+@dataclass(frozen=True)
+class FakeRepo:
+    """Plain stand-in for a GitRepository in tests."""
+
+    name: str
+    path: str
+    branch: str
+    ahead: int
+    behind: int
+    changed_files: int
+    untracked_files: int
+    total_commits: int
+    remote_url: str
+    is_clean: bool
+    status: str
+
+
+@pytest.fixture(scope="session")
 def mock_git_repository():
-    """Create a mock GitRepository instance."""
-    repo = Mock(spec=GitRepository)
-    repo.name = "test-repo"
-    repo.path = "/path/to/test-repo"
-    repo.branch = "main"
-    repo.ahead = 0
-    repo.behind = 0
-    repo.changed_files = 0
-    repo.untracked_files = 0
-    repo.total_commits = 42
-    repo.remote_url = "https://github.com/user/test-repo.git"
-    repo.is_clean = True
-    repo.status = "Clean"
-    return repo
+    """Create a fake GitRepository instance."""
+    return FakeRepo(
+        name="test-repo",
+        path="/path/to/test-repo",
+        branch="main",
+        ahead=0,
+        behind=0,
+        changed_files=0,
+        untracked_files=0,
+        total_commits=42,
+        remote_url="https://github.com/user/test-repo.git",
+        is_clean=True,
+        status="Clean",
+    )
+
+
+@dataclass(frozen=True)
+class FakeScanner:
+    """Plain stand-in for a GitScanner in tests."""
+
+    base_path: str
+
+
+@pytest.fixture(scope="session")
+def mock_git_scanner():
+    """Create a fake GitScanner instance."""
+    return FakeScanner(base_path="/path/to/scan")
+
+
+_CLEAN_SPEC = dict(
+    name="clean-repo",
+    path="/path/to/clean-repo",
+    branch="main",
+    ahead=0,
+    behind=0,
+    changed_files=0,
+    untracked_files=0,
+    total_commits=10,
+    remote_url="https://github.com/user/clean-repo.git",
+    is_clean=True,
+    status="Clean",
+)
+
+_DIRTY_SPEC = dict(
+    name="dirty-repo",
+    path="/path/to/dirty-repo",
+    branch="feature-branch",
+    ahead=2,
+    behind=1,
+    changed_files=3,
+    untracked_files=2,
+    total_commits=25,
+    remote_url="https://github.com/user/dirty-repo.git",
+    is_clean=False,
+    status="Dirty",
+)
+
+
+def _build(spec):
+    """Create a FakeRepo from one of the specs above."""
+    return FakeRepo(**spec)
+
+
+@pytest.fixture(scope="session")
+def sample_repositories():
+    """Create sample repository data for tests."""
+    return (_build(_CLEAN_SPEC), _build(_DIRTY_SPEC))
+
+
+# The clean sample repository under GitRepository's own attribute names. The
+# values come from _CLEAN_SPEC so that both stand-ins share the same objects
+_STRICT_CLEAN = {
+    "name": _CLEAN_SPEC["name"],
+    "path": Path(_CLEAN_SPEC["path"]),
+    "branch": _CLEAN_SPEC["branch"],
+    "rev": "918e0c222f7ca5ea91794c0679cc414e03430bad",
+    "ahead_count": _CLEAN_SPEC["ahead"],
+    "behind_count": _CLEAN_SPEC["behind"],
+    "changed_count": _CLEAN_SPEC["changed_files"],
+    "untracked_count": _CLEAN_SPEC["untracked_files"],
+    "total_commits": _CLEAN_SPEC["total_commits"],
+    "remote_url": _CLEAN_SPEC["remote_url"],
+    "is_valid": True,
+    "status": _CLEAN_SPEC["status"],
+    "has_changes.return_value": not _CLEAN_SPEC["is_clean"],
+}
 
 
 @pytest.fixture
-def mock_git_scanner():
-    """Create a mock GitScanner instance."""
-    scanner = Mock(spec=GitScanner)
-    scanner.base_path = "/path/to/scan"
-    return scanner
+def loose_repo():
+    """
+    Create a GitRepository mock without spec checking. Setting _spec_class
+    alone keeps isinstance(repo, GitRepository) true without walking the
+    class; use strict_repo where reading a misspelled attribute should fail.
+    """
+    repo = Mock()
+    repo._spec_class = GitRepository
+    repo.configure_mock(**_STRICT_CLEAN)
+    return repo
 
 
 @pytest.fixture
-def sample_repositories():
-    """Create sample repository data for tests."""
-    repos = []
-
-    clean_repo = Mock(spec=GitRepository)
-    clean_repo.name = "clean-repo"
-    clean_repo.path = "/path/to/clean-repo"
-    clean_repo.branch = "main"
-    clean_repo.ahead = 0
-    clean_repo.behind = 0
-    clean_repo.changed_files = 0
-    clean_repo.untracked_files = 0
-    clean_repo.total_commits = 10
-    clean_repo.remote_url = "https://github.com/user/clean-repo.git"
-    clean_repo.is_clean = True
-    clean_repo.status = "Clean"
-    repos.append(clean_repo)
-
-    dirty_repo = Mock(spec=GitRepository)
-    dirty_repo.name = "dirty-repo"
-    dirty_repo.path = "/path/to/dirty-repo"
-    dirty_repo.branch = "feature-branch"
-    dirty_repo.ahead = 2
-    dirty_repo.behind = 1
-    dirty_repo.changed_files = 3
-    dirty_repo.untracked_files = 2
-    dirty_repo.total_commits = 25
-    dirty_repo.remote_url = "https://github.com/user/dirty-repo.git"
-    dirty_repo.is_clean = False
-    dirty_repo.status = "Dirty"
-    repos.append(dirty_repo)
-
-    return repos
+def strict_repo():
+    """
+    Create a GitRepository mock for tests that rely on its interface: unlike
+    FakeRepo, reading an attribute GitRepository does not have raises.
+    """
+    repo = Mock(spec=GitRepository)
+    repo.configure_mock(**_STRICT_CLEAN)
+    return repo
 
 
 @pytest.fixture
-def mock_subprocess_run():
+def mock_subprocess_run(monkeypatch):
     """Mock subprocess.run for git commands."""
-    with patch("subprocess.run") as mock_run:
-        # Default successful git command
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "main"
-        mock_run.return_value.stderr = ""
-        yield mock_run
+    mock_run = Mock()
+    # Default successful git command
+    mock_run.return_value.returncode = 0
+    mock_run.return_value.stdout = "main"
+    mock_run.return_value.stderr = ""
+    monkeypatch.setattr(subprocess, "run", mock_run)
+    return mock_run
 
 
 @pytest.fixture
-def mock_os_path_exists():
+def mock_os_path_exists(monkeypatch):
     """Mock os.path.exists for path validation."""
-    with patch("os.path.exists") as mock_exists:
-        mock_exists.return_value = True
-        yield mock_exists
+    mock_exists = Mock(return_value=True)
+    monkeypatch.setattr(os.path, "exists", mock_exists)
+    return mock_exists
 
 
 @pytest.fixture
-def mock_os_path_isdir():
+def mock_os_path_isdir(monkeypatch):
     """Mock os.path.isdir for directory validation."""
-    with patch("os.path.isdir") as mock_isdir:
-        mock_isdir.return_value = True
-        yield mock_isdir
+    mock_isdir = Mock(return_value=True)
+    monkeypatch.setattr(os.path, "isdir", mock_isdir)
+    return mock_isdir
+
+
+# Shared by every mock_os_walk, hence immutable all the way down; code that
+# prunes dirnames in place must work on a list copy
+_OS_WALK_RESULT = (
+    ("/path/to/scan", ("repo1", "repo2"), ()),
+    ("/path/to/scan/repo1", (".git",), ("file1.txt",)),
+    ("/path/to/scan/repo2", (".git",), ("file2.txt",)),
+)
 
 
 @pytest.fixture
-def mock_os_walk():
+def mock_os_walk(monkeypatch):
     """Mock os.walk for directory traversal."""
-    with patch("os.walk") as mock_walk:
-        mock_walk.return_value = [
-            ("/path/to/scan", ["repo1", "repo2"], []),
-            ("/path/to/scan/repo1", [".git"], ["file1.txt"]),
-            ("/path/to/scan/repo2", [".git"], ["file2.txt"]),
-        ]
-        yield mock_walk
+    mock_walk = Mock(return_value=_OS_WALK_RESULT)
+    monkeypatch.setattr(os, "walk", mock_walk)
+    return mock_walk
 
 
 @pytest.fixture
-def mock_sys_argv():
-    """Mock sys.argv for CLI argument testing."""
+def set_argv(monkeypatch):
+    """Set sys.argv for CLI argument testing, restored after the test."""
 
-    def _mock_argv(args):
-        with patch.object(sys, "argv", args):
-            yield
+    def _set_argv(args):
+        monkeypatch.setattr(sys, "argv", args)
 
-    return _mock_argv
+    return _set_argv
 
 
 @pytest.fixture
-def mock_check_git_availability():
+def mock_check_git_availability(monkeypatch):
     """Mock git availability check."""
-    with patch("utils.validation.check_git_availability") as mock_check:
-        mock_check.return_value = True
-        yield mock_check
+    mock_check = Mock(return_value=True)
+    monkeypatch.setattr("cli.check_git_availability", mock_check)
+    return mock_check
 
 
 @pytest.fixture
-def mock_validate_path():
+def mock_validate_path(monkeypatch):
     """Mock path validation."""
-    with patch("utils.validation.validate_path") as mock_validate:
-        mock_validate.return_value = None
-        yield mock_validate
+    mock_validate = Mock(return_value=None)
+    monkeypatch.setattr("cli.validate_path", mock_validate)
+    return mock_validate
 
 
 @pytest.fixture
-def mock_get_current_version():
+def mock_get_current_version(monkeypatch):
     """Mock version retrieval."""
-    with patch("utils.version.get_current_version") as mock_version:
-        mock_version.return_value = "1.0.0"
-        yield mock_version
-
-
-@pytest.fixture
-def temp_git_repo(tmp_path):
-    """Create a temporary git repository for integration tests."""
-    repo_path = tmp_path / "test_repo"
+    mock_version = Mock(return_value="1.0.0")
+    monkeypatch.setattr("cli.get_current_version", mock_version)
+    return mock_version
+
+
+@pytest.fixture(scope="session")
+def git_repo_template(tmp_path_factory):
+    """
+    Create a git repository layout once per session. Tests that only read it
+    can use it directly instead of temp_git_repo.
+    """
+    repo_path = tmp_path_factory.mktemp("template") / "test_repo"
     repo_path.mkdir()
 
     # Create .git directory
@@ -159,32 +246,59 @@ def temp_git_repo(tmp_path):
     (repo_path / "README.md").write_text("# Test Repository")
     (repo_path / "main.py").write_text("print('Hello, World!')")
 
-    return str(repo_path)
+    return repo_path
+
+
+@pytest.fixture
+def temp_git_repo_builder(tmp_path, git_repo_template):
+    """
+    Return a callable creating a fresh copy of git_repo_template under
+    tmp_path on every call, e.g. as the setup of a benchmark round so the
+    copy stays out of the measured time. The files are copied rather than
+    hardlinked, so a test writing into them cannot change the template.
+    """
+    names = (f"test_repo-{n}" if n else "test_repo" for n in itertools.count())
+
+    def _build():
+        repo_path = tmp_path / next(names)
+        shutil.copytree(git_repo_template, repo_path)
+        return str(repo_path)
+
+    return _build
+
+
+@pytest.fixture
+def temp_git_repo(temp_git_repo_builder):
+    """Create a temporary git repository for integration tests."""
+    return temp_git_repo_builder()
+
+
+_HEADER_RE = re.compile(r"Repository.*Branch", re.DOTALL)
+_SUMMARY_RE = re.compile(r"Summary")
 
 
 def assert_table_format(table_output, expected_repos):
     """Helper function to assert table formatting."""
-    lines = table_output.strip().split("\n")
-
     # Check header is present
-    assert any("Repository" in line for line in lines)
-    assert any("Branch" in line for line in lines)
+    assert _HEADER_RE.search(table_output)
 
-    # Check repository names are present
-    for repo in expected_repos:
-        assert any(repo.name in line for line in lines)
+    # Check repository names are present. Longest names first, so that a name
+    # which is a prefix of another one cannot shadow it in the alternation.
+    names = sorted({repo.name for repo in expected_repos}, key=len, reverse=True)
+    if names:
+        pattern = re.compile("|".join(map(re.escape, names)))
+        missing = set(names).difference(pattern.findall(table_output))
+        assert not missing, sorted(missing)
 
 
 def assert_summary_format(summary_output, expected_stats):
     """Helper function to assert summary formatting."""
-    lines = summary_output.strip().split("\n")
-
-    assert any("Summary" in line for line in lines)
+    assert _SUMMARY_RE.search(summary_output)
 
     # Check statistics are present
     if "total" in expected_stats:
-        assert any(str(expected_stats["total"]) in line for line in lines)
+        assert str(expected_stats["total"]) in summary_output
     if "clean" in expected_stats:
-        assert any(str(expected_stats["clean"]) in line for line in lines)
+        assert str(expected_stats["clean"]) in summary_output
     if "dirty" in expected_stats:
-        assert any(str(expected_stats["dirty"]) in line for line in lines)
+        assert str(expected_stats["dirty"]) in summary_output
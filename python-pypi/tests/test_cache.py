@@ -0,0 +1,81 @@
+"""
+Unit tests for the CommitCountCache class.
+"""
+
+import json
+from pathlib import Path
+
+from git_tools.cache import CommitCountCache, default_cache_path
+
+
+OID = "918e0c222f7ca5ea91794c0679cc414e03430bad"
+
+
+class TestDefaultCachePath:
+    """Tests for default_cache_path function."""
+
+    def test_default_cache_path_xdg(self, monkeypatch, tmp_path):
+        """Test the cache lives under $XDG_CACHE_HOME when it is set."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert default_cache_path() == tmp_path / "gits-statuses" / "cache.json"
+
+    def test_default_cache_path_home(self, monkeypatch):
+        """Test the cache falls back to ~/.cache."""
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        assert default_cache_path() == (
+            Path.home() / ".cache" / "gits-statuses" / "cache.json"
+        )
+
+
+class TestCommitCountCache:
+    """Tests for CommitCountCache class."""
+
+    def test_get_missing(self, tmp_path):
+        """Test get on an empty cache."""
+        cache = CommitCountCache(tmp_path / "cache.json")
+
+        assert cache.get(Path("/repo"), OID) is None
+
+    def test_set_and_get(self, tmp_path):
+        """Test get returns a count only for the commit it was stored with."""
+        cache = CommitCountCache(tmp_path / "cache.json")
+        cache.set(Path("/repo"), OID, 42)
+
+        assert cache.get(Path("/repo"), OID) == 42
+        assert cache.get(Path("/repo"), "0" * 40) is None
+        assert cache.get(Path("/other"), OID) is None
+
+    def test_save_and_load(self, tmp_path):
+        """Test the cache survives a round trip through its file."""
+        cache_path = tmp_path / "nested" / "cache.json"
+        cache = CommitCountCache(cache_path)
+        cache.set(Path("/repo"), OID, 42)
+        cache.save()
+
+        assert CommitCountCache(cache_path).get(Path("/repo"), OID) == 42
+
+    def test_save_unchanged_does_not_write(self, tmp_path):
+        """Test save leaves the file alone when nothing changed."""
+        cache_path = tmp_path / "cache.json"
+        CommitCountCache(cache_path).save()
+
+        assert not cache_path.exists()
+
+    def test_load_corrupt_file(self, tmp_path):
+        """Test a corrupt cache file is treated as empty."""
+        cache_path = tmp_path / "cache.json"
+        cache_path.write_text("{not json")
+
+        assert CommitCountCache(cache_path).get(Path("/repo"), OID) is None
+
+    def test_load_skips_malformed_entries(self, tmp_path):
+        """Test entries of the wrong shape are dropped."""
+        cache_path = tmp_path / "cache.json"
+        cache_path.write_text(json.dumps({"/repo": [OID, "42"], "/ok": [OID, 7]}))
+
+        cache = CommitCountCache(cache_path)
+
+        assert cache.get(Path("/repo"), OID) is None
+        assert cache.get(Path("/ok"), OID) == 7
@@ -3,6 +3,7 @@ Unit tests for the CLI module.
 """
 
 import pytest
+from pathlib import Path
 from unittest.mock import patch, Mock
 import argparse
 
@@ -45,6 +46,36 @@ class TestCreateParser:
         args = parser.parse_args(["--detailed"])
         assert args.detailed is True
 
+    def test_parser_has_jobs_argument(self):
+        """Test that the parser has a jobs argument."""
+        parser = create_parser()
+        args = parser.parse_args([])
+        assert args.jobs is None
+
+        args = parser.parse_args(["--jobs", "4"])
+        assert args.jobs == 4
+
+        args = parser.parse_args(["-j", "2"])
+        assert args.jobs == 2
+
+    def test_parser_has_no_cache_argument(self):
+        """Test that the parser has a no-cache argument."""
+        parser = create_parser()
+        args = parser.parse_args([])
+        assert args.no_cache is False
+
+        args = parser.parse_args(["--no-cache"])
+        assert args.no_cache is True
+
+    def test_parser_has_deadline_argument(self):
+        """Test that the parser has a deadline argument."""
+        parser = create_parser()
+        args = parser.parse_args([])
+        assert args.deadline is None
+
+        args = parser.parse_args(["--deadline", "2.5"])
+        assert args.deadline == 2.5
+
 
 class TestMain:
     """Tests for the main function."""
@@ -54,7 +85,12 @@ class TestMain:
     @patch("cli.GitScanner")
     @patch("cli.TableFormatter")
     def test_main_success_no_repos(
-        self, mock_formatter, mock_scanner_class, mock_validate_path, mock_check_git
+        self,
+        mock_formatter,
+        mock_scanner_class,
+        mock_validate_path,
+        mock_check_git,
+        capsys,
     ):
         """Test main function with no repositories found."""
         # Setup mocks
@@ -64,10 +100,10 @@ class TestMain:
         mock_scanner = Mock()
         mock_scanner.scan.return_value = []
         mock_scanner_class.return_value = mock_scanner
+        mock_formatter.format_repositories.return_value = "Repository table"
 
         with patch("sys.argv", ["gits-statuses"]):
-            with patch("builtins.print") as mock_print:
-                result = main()
+            result = main()
 
         assert result == 0
         mock_check_git.assert_called_once()
@@ -75,8 +111,7 @@ class TestMain:
         mock_scanner.scan.assert_called_once()
 
         # Check that "No Git repositories found" message is printed
-        print_calls = [str(call) for call in mock_print.call_args_list]
-        assert any("No Git repositories found" in call for call in print_calls)
+        assert "No Git repositories found" in capsys.readouterr().out
 
     @patch("cli.check_git_availability")
     @patch("cli.validate_path")
@@ -109,7 +144,7 @@ class TestMain:
         mock_formatter.format_summary.return_value = "Summary table"
 
         with patch("sys.argv", ["gits-statuses"]):
-            with patch("builtins.print"):
+            with patch("sys.stdout") as mock_stdout:
                 result = main()
 
         assert result == 0
@@ -119,6 +154,9 @@ class TestMain:
         mock_scanner.get_summary_stats.assert_called_once()
         mock_formatter.format_repositories.assert_called_once()
         mock_formatter.format_summary.assert_called_once()
+        mock_stdout.write.assert_called_once_with(
+            "\nFound 2 Git repositories:\n\nRepository table\nSummary table\n"
+        )
 
         # Check that repositories are sorted by name
         repositories.sort(key=lambda repo: repo.name.lower())
@@ -186,8 +224,14 @@ class TestMain:
     @patch("cli.validate_path")
     @patch("cli.GitScanner")
     @patch("cli.TableFormatter")
+    @patch("cli.CommitCountCache")
     def test_main_with_detailed_flag(
-        self, mock_formatter, mock_scanner_class, mock_validate_path, mock_check_git
+        self,
+        mock_cache_class,
+        mock_formatter,
+        mock_scanner_class,
+        mock_validate_path,
+        mock_check_git,
     ):
         """Test main function with detailed flag."""
         mock_check_git.return_value = True
@@ -216,13 +260,24 @@ class TestMain:
         mock_formatter.format_repositories.assert_called_once_with(
             repositories, show_url=True
         )
+        assert mock_scanner_class.call_args.kwargs["count_commits"] is True
+        assert (
+            mock_scanner_class.call_args.kwargs["cache"]
+            is mock_cache_class.return_value
+        )
 
     @patch("cli.check_git_availability")
     @patch("cli.validate_path")
     @patch("cli.GitScanner")
     @patch("cli.TableFormatter")
+    @patch("cli.CommitCountCache")
     def test_main_with_custom_path(
-        self, mock_formatter, mock_scanner_class, mock_validate_path, mock_check_git
+        self,
+        mock_cache_class,
+        mock_formatter,
+        mock_scanner_class,
+        mock_validate_path,
+        mock_check_git,
     ):
         """Test main function with custom path."""
         mock_check_git.return_value = True
@@ -232,13 +287,76 @@ class TestMain:
         mock_scanner.scan.return_value = []
         mock_scanner_class.return_value = mock_scanner
 
+        mock_formatter.format_repositories.return_value = "Repository table"
+
         custom_path = "/custom/path"
         with patch("sys.argv", ["gits-statuses", "--path", custom_path]):
             result = main()
 
         assert result == 0
         mock_validate_path.assert_called_once_with(custom_path)
-        mock_scanner_class.assert_called_once_with(custom_path)
+        # The default view never counts commits, so the cache is not loaded
+        mock_cache_class.assert_not_called()
+        mock_scanner_class.assert_called_once_with(
+            custom_path,
+            jobs=None,
+            cache=None,
+            deadline=None,
+            count_commits=False,
+        )
+
+    @patch("cli.check_git_availability", return_value=True)
+    @patch("cli.validate_path")
+    @patch("cli.GitScanner")
+    @patch("cli.TableFormatter")
+    def test_main_reports_timed_out_repositories(
+        self,
+        mock_formatter,
+        mock_scanner_class,
+        mock_validate_path,
+        mock_check_git,
+        capsys,
+    ):
+        """Test main lists the repositories skipped by the deadline."""
+        mock_scanner = Mock()
+        mock_scanner.scan.return_value = []
+        mock_scanner.timed_out = [Path("/projects/slow")]
+        mock_scanner_class.return_value = mock_scanner
+        mock_formatter.format_repositories.return_value = "Repository table"
+
+        with patch("sys.argv", ["gits-statuses", "--deadline", "3"]):
+            result = main()
+
+        assert result == 0
+        assert capsys.readouterr().out.endswith(
+            "\n\n1 repositories not inspected within 3s: slow\n"
+        )
+
+    @pytest.mark.parametrize("jobs", ["0", "-2"])
+    @patch("cli.GitScanner")
+    def test_main_rejects_non_positive_jobs(self, mock_scanner_class, jobs, capsys):
+        """Test main exits with a usage error for zero or negative jobs."""
+        with patch("sys.argv", ["gits-statuses", "--jobs", jobs]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 2
+        assert "--jobs must be a positive number" in capsys.readouterr().err
+        mock_scanner_class.assert_not_called()
+
+    @pytest.mark.parametrize("deadline", ["0", "-1"])
+    @patch("cli.GitScanner")
+    def test_main_rejects_non_positive_deadline(
+        self, mock_scanner_class, deadline, capsys
+    ):
+        """Test main exits with a usage error for a deadline of zero or less."""
+        with patch("sys.argv", ["gits-statuses", "--deadline", deadline]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 2
+        assert "--deadline must be a positive number" in capsys.readouterr().err
+        mock_scanner_class.assert_not_called()
 
 
 class TestMainIntegration:
@@ -0,0 +1,25 @@
+"""
+Unit tests for the shared test fixtures.
+"""
+
+import pytest
+
+from src.git_tools import GitRepository
+
+
+class TestRepositoryMocks:
+    """Tests for the GitRepository mock fixtures."""
+
+    def test_loose_repo_is_a_git_repository(self, loose_repo):
+        """Test loose_repo passes isinstance checks without a spec."""
+        assert isinstance(loose_repo, GitRepository)
+        assert loose_repo.name == "clean-repo"
+        assert loose_repo.has_changes() is False
+
+    def test_strict_repo_rejects_unknown_attributes(self, strict_repo):
+        """Test strict_repo raises for attributes GitRepository lacks."""
+        assert isinstance(strict_repo, GitRepository)
+        assert strict_repo.ahead_count == 0
+
+        with pytest.raises(AttributeError):
+            getattr(strict_repo, "ahead")
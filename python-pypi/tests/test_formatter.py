@@ -15,14 +15,9 @@ class TestTableFormatterRepositories:
         result = TableFormatter.format_repositories([])
         assert result == "No Git repositories found."
 
-    def test_format_repositories_standard_view_no_changes(self):
+    def test_format_repositories_standard_view_no_changes(self, strict_repo):
         """Test format_repositories in standard view with no changes."""
-        # Create mock repositories with no changes
-        clean_repo = Mock()
-        clean_repo.name = "clean-repo"
-        clean_repo.has_changes.return_value = False
-
-        repositories = [clean_repo]
+        repositories = [strict_repo]
         result = TableFormatter.format_repositories(repositories, show_url=False)
 
         assert (
@@ -97,21 +92,8 @@ class TestTableFormatterRepositories:
         assert "↑1 ~2 ?1" in result  # status
         assert "https://github.com/user/test-repo.git" in result
 
-    def test_format_repositories_mixed_states(self):
+    def test_format_repositories_mixed_states(self, strict_repo):
         """Test format_repositories with repositories in different states."""
-        # Clean repo
-        clean_repo = Mock()
-        clean_repo.name = "clean-repo"
-        clean_repo.branch = "main"
-        clean_repo.rev = "918e0c222f7ca5ea91794c0679cc414e03430bad"
-        clean_repo.ahead_count = 0
-        clean_repo.behind_count = 0
-        clean_repo.changed_count = 0
-        clean_repo.untracked_count = 0
-        clean_repo.total_commits = 10
-        clean_repo.status = "Clean"
-        clean_repo.remote_url = "https://github.com/user/clean-repo.git"
-
         # Dirty repo
         dirty_repo = Mock()
         dirty_repo.name = "dirty-repo"
@@ -125,7 +107,7 @@ class TestTableFormatterRepositories:
         dirty_repo.status = "↑3 ↓2 ~5 ?2"
         dirty_repo.remote_url = "https://github.com/user/dirty-repo.git"
 
-        repositories = [clean_repo, dirty_repo]
+        repositories = [strict_repo, dirty_repo]
         result = TableFormatter.format_repositories(repositories, show_url=True)
 
         lines = result.split("\n")
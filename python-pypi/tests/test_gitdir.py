@@ -0,0 +1,235 @@
+"""
+Unit tests for the gitdir helper functions.
+"""
+
+import pytest
+
+from git_tools.gitdir import (
+    is_shallow,
+    read_head_oid,
+    read_remote_url,
+    resolve_common_dir,
+    resolve_git_dir,
+)
+
+OID = "918e0c222f7ca5ea91794c0679cc414e03430bad"
+
+
+def write_config(git_dir, text):
+    """Create a git directory containing the given config file."""
+    git_dir.mkdir(parents=True, exist_ok=True)
+    (git_dir / "config").write_text(text)
+
+
+class TestResolveGitDir:
+    """Tests for resolve_git_dir function."""
+
+    def test_resolve_git_dir_directory(self, tmp_path):
+        """Test resolve_git_dir with a regular .git directory."""
+        (tmp_path / ".git").mkdir()
+
+        assert resolve_git_dir(tmp_path) == tmp_path / ".git"
+
+    def test_resolve_git_dir_file(self, tmp_path):
+        """Test resolve_git_dir with a .git file (worktree or submodule)."""
+        (tmp_path / ".git").write_text("gitdir: ../main/.git/worktrees/wt\n")
+
+        assert resolve_git_dir(tmp_path) == tmp_path / "../main/.git/worktrees/wt"
+
+    def test_resolve_git_dir_invalid_file(self, tmp_path):
+        """Test resolve_git_dir with an unrecognized .git file."""
+        (tmp_path / ".git").write_text("garbage")
+
+        with pytest.raises(ValueError):
+            resolve_git_dir(tmp_path)
+
+    def test_resolve_git_dir_missing(self, tmp_path):
+        """Test resolve_git_dir without a .git entry."""
+        with pytest.raises(OSError):
+            resolve_git_dir(tmp_path)
+
+    def test_resolve_common_dir(self, tmp_path):
+        """Test resolve_common_dir with and without a commondir file."""
+        assert resolve_common_dir(tmp_path) == tmp_path
+
+        (tmp_path / "commondir").write_text("../..\n")
+        assert resolve_common_dir(tmp_path) == tmp_path / "../.."
+
+
+class TestReadRemoteUrl:
+    """Tests for read_remote_url function."""
+
+    def test_read_remote_url(self, tmp_path):
+        """Test read_remote_url with an origin remote."""
+        write_config(
+            tmp_path / ".git",
+            "[core]\n"
+            "\trepositoryformatversion = 0\n"
+            '[remote "origin"]\n'
+            "\turl = https://github.com/user/repo.git\n"
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*\n",
+        )
+
+        assert read_remote_url(tmp_path) == "https://github.com/user/repo.git"
+
+    def test_read_remote_url_no_remote(self, tmp_path):
+        """Test read_remote_url without an origin remote."""
+        write_config(
+            tmp_path / ".git",
+            '[core]\n\tbare = false\n[remote "upstream"]\n\turl = https://x/y.git\n',
+        )
+
+        assert read_remote_url(tmp_path) is None
+
+    def test_read_remote_url_worktree(self, tmp_path):
+        """Test read_remote_url from a linked worktree."""
+        main_git = tmp_path / "main" / ".git"
+        write_config(main_git, '[remote "origin"]\n\turl = git@host:repo.git\n')
+        worktree_git = main_git / "worktrees" / "wt"
+        worktree_git.mkdir(parents=True)
+        (worktree_git / "commondir").write_text("../..\n")
+        worktree = tmp_path / "wt"
+        worktree.mkdir()
+        (worktree / ".git").write_text(f"gitdir: {worktree_git}\n")
+
+        assert read_remote_url(worktree) == "git@host:repo.git"
+
+    def test_read_remote_url_include(self, tmp_path):
+        """Test read_remote_url defers to git when the config uses includes."""
+        write_config(tmp_path / ".git", "[include]\n\tpath = extra.config\n")
+
+        with pytest.raises(ValueError):
+            read_remote_url(tmp_path)
+
+    def test_read_remote_url_section_name_case(self, tmp_path):
+        """Test read_remote_url matches the section name case-insensitively."""
+        write_config(tmp_path / ".git", '[Remote "origin"]\n\turl = https://x/y.git\n')
+
+        assert read_remote_url(tmp_path) == "https://x/y.git"
+
+    def test_read_remote_url_subsection_case(self, tmp_path):
+        """Test read_remote_url keeps the subsection name case-sensitive."""
+        write_config(tmp_path / ".git", '[remote "Origin"]\n\turl = https://x/y.git\n')
+
+        assert read_remote_url(tmp_path) is None
+
+    def test_read_remote_url_quoted(self, tmp_path):
+        """Test read_remote_url strips quotes, which also protect ; and #."""
+        write_config(
+            tmp_path / ".git", '[remote "origin"]\n\turl = "https://x/y;z#w"\n'
+        )
+
+        assert read_remote_url(tmp_path) == "https://x/y;z#w"
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "C:\\\\path\\\\repo",
+            '"a\\"b"',
+            "https://a/x;c",
+            "https://a/x#c",
+            "https://a/x ; comment",
+        ],
+        ids=["backslash", "inner-quote", "semicolon", "hash", "comment"],
+    )
+    def test_read_remote_url_needs_git(self, tmp_path, url):
+        """Test read_remote_url defers to git for values it cannot decode."""
+        write_config(tmp_path / ".git", f'[remote "origin"]\n\turl = {url}\n')
+
+        with pytest.raises(ValueError):
+            read_remote_url(tmp_path)
+
+    def test_read_remote_url_continuation_line(self, tmp_path):
+        """Test read_remote_url defers to git for a deeper indented next key."""
+        write_config(
+            tmp_path / ".git",
+            '[remote "origin"]\n'
+            "url = https://example.com/a.git\n"
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*\n",
+        )
+
+        with pytest.raises(ValueError):
+            read_remote_url(tmp_path)
+
+    def test_read_remote_url_several_sections(self, tmp_path):
+        """Test read_remote_url defers to git when origin is set twice."""
+        write_config(
+            tmp_path / ".git",
+            '[remote "origin"]\n\turl = https://x/a.git\n'
+            '[Remote "origin"]\n\turl = https://x/b.git\n',
+        )
+
+        with pytest.raises(ValueError):
+            read_remote_url(tmp_path)
+
+    def test_read_remote_url_unparsable(self, tmp_path):
+        """Test read_remote_url with a config configparser cannot read."""
+        write_config(tmp_path / ".git", "url = outside-any-section\n")
+
+        with pytest.raises(ValueError):
+            read_remote_url(tmp_path)
+
+
+class TestIsShallow:
+    """Tests for is_shallow function."""
+
+    def test_is_shallow(self, tmp_path):
+        """Test is_shallow follows the shallow file of the git directory."""
+        (tmp_path / ".git").mkdir()
+        assert is_shallow(tmp_path) is False
+
+        (tmp_path / ".git" / "shallow").write_text(OID + "\n")
+        assert is_shallow(tmp_path) is True
+
+
+class TestReadHeadOid:
+    """Tests for read_head_oid function."""
+
+    def test_read_head_oid_loose_ref(self, tmp_path):
+        """Test read_head_oid follows HEAD to a loose branch ref."""
+        git_dir = tmp_path / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "refs" / "heads" / "main").write_text(OID + "\n")
+
+        assert read_head_oid(tmp_path) == OID
+
+    def test_read_head_oid_packed_ref(self, tmp_path):
+        """Test read_head_oid falls back to packed-refs."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "packed-refs").write_text(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            f"{'0' * 40} refs/heads/other\n"
+            f"{OID} refs/heads/main\n"
+        )
+
+        assert read_head_oid(tmp_path) == OID
+
+    def test_read_head_oid_detached(self, tmp_path):
+        """Test read_head_oid with a detached HEAD."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text(OID + "\n")
+
+        assert read_head_oid(tmp_path) == OID
+
+    def test_read_head_oid_unborn_branch(self, tmp_path):
+        """Test read_head_oid on a branch without commits."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (git_dir / "packed-refs").write_text("")
+
+        with pytest.raises(ValueError):
+            read_head_oid(tmp_path)
+
+    def test_read_head_oid_not_an_oid(self, tmp_path):
+        """Test read_head_oid rejects a ref that is not a commit hash."""
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("garbage\n")
+
+        with pytest.raises(ValueError):
+            read_head_oid(tmp_path)
@@ -19,7 +19,12 @@ class TestCliIntegration:
     @patch("cli.TableFormatter")
     @patch("sys.argv", ["gits-statuses"])
     def test_cli_full_workflow_no_repositories(
-        self, mock_formatter, mock_scanner_class, mock_validate_path, mock_check_git
+        self,
+        mock_formatter,
+        mock_scanner_class,
+        mock_validate_path,
+        mock_check_git,
+        capsys,
     ):
         """Test full CLI workflow with no repositories found."""
         # Setup mocks
@@ -29,9 +34,9 @@ class TestCliIntegration:
         mock_scanner = Mock()
         mock_scanner.scan.return_value = []
         mock_scanner_class.return_value = mock_scanner
+        mock_formatter.format_repositories.return_value = "Repository table"
 
-        with patch("builtins.print") as mock_print:
-            result = main()
+        result = main()
 
         assert result == 0
         mock_check_git.assert_called_once()
@@ -39,8 +44,7 @@ class TestCliIntegration:
         mock_scanner.scan.assert_called_once()
 
         # Verify output
-        print_calls = [str(call) for call in mock_print.call_args_list]
-        assert any("No Git repositories found" in call for call in print_calls)
+        assert "No Git repositories found" in capsys.readouterr().out
 
     @patch("cli.check_git_availability")
     @patch("cli.validate_path")
@@ -105,33 +109,29 @@ class TestScannerRepositoryIntegration:
     """Integration tests for GitScanner and GitRepository."""
 
     @patch("subprocess.run")
-    def test_repository_git_operations_integration(self, mock_run):
+    @patch("subprocess.Popen")
+    def test_repository_git_operations_integration(self, mock_popen, mock_run):
         """Test GitRepository integration with git operations."""
-        # Mock git command responses
-        mock_run.side_effect = [
-            # _is_git_repository
-            Mock(returncode=0, stdout="true"),
-            # _get_current_branch
-            Mock(returncode=0, stdout="main\n"),
-            # _get_remote_url
-            Mock(returncode=0, stdout="https://github.com/user/repo.git\n"),
-            # _get_ahead_count - upstream check
-            Mock(returncode=0, stdout="origin/main\n"),
-            # _get_ahead_count - count
-            Mock(returncode=0, stdout="2\n"),
-            # _get_behind_count - upstream check
-            Mock(returncode=0, stdout="origin/main\n"),
-            # _get_behind_count - count
-            Mock(returncode=0, stdout="1\n"),
-            # _get_changed_count
-            Mock(returncode=0, stdout=" M file1.txt\n?? file2.txt\n"),
-            # _get_untracked_count
-            Mock(returncode=0, stdout=" M file1.txt\n?? file2.txt\n"),
-            # _get_total_commits
-            Mock(returncode=0, stdout="42\n"),
-        ]
-
-        repo = GitRepository("/path/to/repo")
+        status = Mock(returncode=0)
+        status.communicate.return_value = (
+            b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+            b"# branch.head main\x00"
+            b"# branch.upstream origin/main\x00"
+            b"# branch.ab +2 -1\x00"
+            b"1 .M N... 100644 100644 100644 abc123 abc123 file1.txt\x00"
+            b"? file2.txt\x00",
+            None,
+        )
+        total_commits = Mock(returncode=0)
+        total_commits.communicate.return_value = (b"42\n", None)
+        mock_popen.side_effect = [status, total_commits]
+
+        # _get_remote_url
+        mock_run.return_value = Mock(
+            returncode=0, stdout=b"https://github.com/user/repo.git\n"
+        )
+
+        repo = GitRepository("/path/to/repo", count_commits=True)
 
         assert repo.is_valid is True
         assert repo.branch == "main"
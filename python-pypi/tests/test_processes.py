@@ -0,0 +1,47 @@
+"""
+Unit tests for the ProcessGroup class.
+"""
+
+from unittest.mock import Mock
+
+from git_tools.processes import ProcessGroup
+
+
+class TestProcessGroup:
+    """Tests for ProcessGroup class."""
+
+    def test_kill_tracked_processes(self):
+        """Test kill kills every process still tracked."""
+        group = ProcessGroup()
+        running = Mock()
+        finished = Mock()
+        group.add(running)
+        group.add(finished)
+        group.discard(finished)
+
+        group.kill()
+
+        running.kill.assert_called_once()
+        finished.kill.assert_not_called()
+        assert group.killed is True
+
+    def test_add_after_kill(self):
+        """Test a process added after kill is killed straight away."""
+        group = ProcessGroup()
+        group.kill()
+        proc = Mock()
+
+        group.add(proc)
+
+        proc.kill.assert_called_once()
+
+    def test_kill_exited_process(self):
+        """Test kill ignores a process that has already exited."""
+        group = ProcessGroup()
+        proc = Mock()
+        proc.kill.side_effect = ProcessLookupError()
+        group.add(proc)
+
+        group.kill()
+
+        proc.kill.assert_called_once()
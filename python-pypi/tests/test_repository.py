@@ -3,57 +3,78 @@ Unit tests for the GitRepository class.
 """
 
 from unittest.mock import patch, Mock
+import os
 import subprocess
 from pathlib import Path
 
 from git_tools import GitRepository
+from git_tools.repository import _COUNT_COMMITS_ARGS, _GIT_OPTIONS, _STATUS_ARGS
+from utils.validation import GIT
+
+
+STATUS_OUTPUT = (
+    b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+    b"# branch.head main\x00"
+    b"# branch.upstream origin/main\x00"
+    b"# branch.ab +2 -1\x00"
+    b"1 .M N... 100644 100644 100644 abc123 abc123 file1.txt\x00"
+    b"1 A. N... 000000 100644 100644 000000 def456 file2.txt\x00"
+    b"2 R. N... 100644 100644 100644 abc123 abc123 R100 new.txt\x00old.txt\x00"
+    b"? file3.txt\x00"
+)
+
+
+def make_process(stdout=b"", returncode=0):
+    """Create a mock Popen handle that finishes with the given output."""
+    proc = Mock()
+    proc.communicate.return_value = (stdout, None)
+    proc.returncode = returncode
+    return proc
+
+
+def make_repo(path="/path/to/repo", count_commits=True):
+    """Create a repo instance without running any git command."""
+    repo = GitRepository.__new__(GitRepository)
+    repo.path = Path(path)
+    repo.name = repo.path.name
+    repo.cache = None
+    repo.count_commits = count_commits
+    repo.processes = None
+    return repo
 
 
 class TestGitRepositoryInit:
     """Tests for GitRepository initialization."""
 
-    @patch("git_tools.repository.GitRepository._is_git_repository")
-    def test_init_valid_repository(self, mock_is_git_repo):
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_init_valid_repository(self, mock_popen):
         """Test initialization with valid git repository."""
-        mock_is_git_repo.return_value = True
+        mock_popen.side_effect = [make_process(STATUS_OUTPUT), make_process(b"42\n")]
 
         with patch.object(
-            GitRepository, "_get_current_branch", return_value="main"
-        ), patch.object(
             GitRepository,
             "_get_remote_url",
             return_value="https://github.com/test/repo.git",
-        ), patch.object(
-            GitRepository, "_get_ahead_count", return_value=2
-        ), patch.object(
-            GitRepository, "_get_behind_count", return_value=1
-        ), patch.object(
-            GitRepository, "_get_changed_count", return_value=3
-        ), patch.object(
-            GitRepository, "_get_untracked_count", return_value=1
-        ), patch.object(
-            GitRepository, "_get_total_commits", return_value=42
-        ), patch.object(
-            GitRepository, "_get_status_summary", return_value="↑2 ↓1 ~3 ?1"
         ):
-            repo = GitRepository("/path/to/repo")
+            repo = GitRepository("/path/to/repo", count_commits=True)
 
             assert repo.path == Path("/path/to/repo")
             assert repo.name == "repo"
             assert repo.is_valid is True
             assert repo.branch == "main"
+            assert repo.rev == "918e0c222f7ca5ea91794c0679cc414e03430bad"
             assert repo.remote_url == "https://github.com/test/repo.git"
             assert repo.ahead_count == 2
             assert repo.behind_count == 1
-            assert repo.changed_count == 3
+            assert repo.changed_count == 4
             assert repo.untracked_count == 1
             assert repo.total_commits == 42
-            assert repo.status == "↑2 ↓1 ~3 ?1"
+            assert repo.status == "↑2 ↓1 ~4 ?1"
 
-    @patch("git_tools.repository.GitRepository._is_git_repository")
-    def test_init_invalid_repository(self, mock_is_git_repo):
+    @patch("git_tools.repository.GitRepository.spawn_all")
+    def test_init_invalid_repository(self, mock_spawn_all):
         """Test initialization with invalid git repository."""
-        mock_is_git_repo.return_value = False
+        mock_spawn_all.return_value = {}
 
         repo = GitRepository("/path/to/non-repo")
 
@@ -70,141 +91,255 @@ class TestGitRepositoryInit:
         assert repo.status == "Invalid"
 
 
-class TestGitRepositoryValidation:
-    """Tests for git repository validation."""
+class TestGitRepositorySpawnCollect:
+    """Tests for launching and collecting the git queries."""
 
-    @patch("git_tools.repository.subprocess.run")
-    def test_is_git_repository_valid(self, mock_run):
-        """Test _is_git_repository with valid repository."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "true"
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_spawn_all_starts_every_query(self, mock_popen):
+        """Test spawn_all starts all queries before waiting on any of them."""
+        mock_popen.side_effect = [make_process(), make_process()]
+        repo = make_repo()
 
-        # Create repo instance without calling other methods
-        repo = GitRepository.__new__(GitRepository)
-        repo.path = Path("/path/to/repo")
+        handles = repo.spawn_all()
 
-        result = repo._is_git_repository()
+        assert set(handles) == {"status", "total_commits"}
+        assert [c.args[0] for c in mock_popen.call_args_list] == [
+            (GIT, *_GIT_OPTIONS, "-C", "/path/to/repo", *_STATUS_ARGS),
+            (GIT, *_GIT_OPTIONS, "-C", "/path/to/repo", *_COUNT_COMMITS_ARGS),
+        ]
+        for c in mock_popen.call_args_list:
+            # Only Windows needs the descriptors closed, see _CLOSE_FDS
+            assert c.kwargs["close_fds"] is (os.name == "nt")
+            assert "cwd" not in c.kwargs
+        for proc in handles.values():
+            proc.communicate.assert_not_called()
+
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_processes_are_tracked_until_collected(self, mock_popen):
+        """Test every git process is in the process group while it runs."""
+        mock_popen.return_value = make_process(STATUS_OUTPUT)
+        repo = make_repo(count_commits=False)
+        repo.processes = Mock()
+
+        handles = repo.spawn_all()
+        repo.processes.add.assert_called_once_with(handles["status"])
+        repo.processes.discard.assert_not_called()
+
+        repo.collect(handles)
+        repo.processes.discard.assert_called_once_with(handles["status"])
+
+    def test_git_prefix_skips_optional_locks(self):
+        """Test every git command runs without taking optional locks."""
+        repo = make_repo()
+
+        assert repo._git_prefix[:2] == (GIT, "--no-optional-locks")
+        assert repo._git_prefix[-2:] == ("-C", "/path/to/repo")
+
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_spawn_all_skips_counting_commits(self, mock_popen):
+        """Test spawn_all leaves the commit count for later by default."""
+        mock_popen.return_value = make_process()
+        repo = make_repo(count_commits=False)
+
+        assert set(repo.spawn_all()) == {"status"}
+        mock_popen.assert_called_once()
+
+    @patch("git_tools.repository.is_shallow", return_value=False)
+    @patch("git_tools.repository.read_head_oid", return_value="a" * 40)
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_spawn_all_uses_cached_total_commits(
+        self, mock_popen, mock_head, mock_shallow
+    ):
+        """Test spawn_all skips counting commits when the count is cached."""
+        mock_popen.return_value = make_process()
+        repo = make_repo()
+        repo.cache = Mock()
+        repo.cache.get.return_value = 42
+
+        handles = repo.spawn_all()
+
+        assert set(handles) == {"status"}
+        assert repo.total_commits == 42
+        repo.cache.get.assert_called_once_with(repo.path.resolve(), "a" * 40)
+
+    @patch("git_tools.repository.subprocess.Popen")
+    def test_spawn_all_missing_directory(self, mock_popen):
+        """Test spawn_all when the process cannot be started."""
+        mock_popen.side_effect = FileNotFoundError()
+        repo = make_repo()
+
+        assert repo.spawn_all() == {}
+        assert repo.collect({}) is False
+
+    def test_collect_valid(self):
+        """Test collect parses the output of every query."""
+        repo = make_repo()
+
+        result = repo.collect(
+            {
+                "status": make_process(STATUS_OUTPUT),
+                "total_commits": make_process(b"42\n"),
+            }
+        )
 
         assert result is True
-        mock_run.assert_called_once_with(
-            ["git", "rev-parse", "--is-inside-work-tree"],
-            cwd=repo.path,
-            capture_output=True,
-            text=True,
-            timeout=5,
+        assert repo.branch == "main"
+        assert repo.rev == "918e0c222f7ca5ea91794c0679cc414e03430bad"
+        assert repo.ahead_count == 2
+        assert repo.behind_count == 1
+        assert repo.changed_count == 4
+        assert repo.untracked_count == 1
+        assert repo.total_commits == 42
+
+    @patch("git_tools.repository.is_shallow", return_value=False)
+    def test_collect_stores_total_commits_in_cache(self, mock_shallow):
+        """Test collect caches a freshly counted total under the HEAD commit."""
+        repo = make_repo()
+        repo.cache = Mock()
+
+        repo.collect(
+            {
+                "status": make_process(STATUS_OUTPUT),
+                "total_commits": make_process(b"42\n"),
+            }
         )
 
-    @patch("subprocess.run")
-    def test_is_git_repository_invalid(self, mock_run):
-        """Test _is_git_repository with invalid repository."""
-        mock_run.return_value.returncode = 1
-        mock_run.return_value.stdout = "false"
-
-        repo = GitRepository("/path/to/non-repo")
-        result = repo._is_git_repository()
-
-        assert result is False
+        repo.cache.set.assert_called_once_with(
+            repo.path.resolve(), "918e0c222f7ca5ea91794c0679cc414e03430bad", 42
+        )
 
-    @patch("subprocess.run")
-    def test_is_git_repository_timeout(self, mock_run):
-        """Test _is_git_repository with timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired(["git"], 5)
+    @patch("git_tools.repository.is_shallow", return_value=True)
+    @patch("git_tools.repository.read_head_oid", return_value="a" * 40)
+    def test_shallow_clone_bypasses_cache(self, mock_head, mock_shallow):
+        """Test a shallow clone's commits are neither looked up nor cached."""
+        repo = make_repo()
+        repo.cache = Mock()
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._is_git_repository()
+        with patch.object(
+            GitRepository, "_spawn", return_value=make_process(STATUS_OUTPUT)
+        ):
+            handles = repo.spawn_all()
+        assert set(handles) == {"status", "total_commits"}
+
+        repo.collect(
+            {
+                "status": make_process(STATUS_OUTPUT),
+                "total_commits": make_process(b"42\n"),
+            }
+        )
 
-        assert result is False
+        assert repo.total_commits == 42
+        repo.cache.get.assert_not_called()
+        repo.cache.set.assert_not_called()
 
-    @patch("subprocess.run")
-    def test_is_git_repository_file_not_found(self, mock_run):
-        """Test _is_git_repository with git not found."""
-        mock_run.side_effect = FileNotFoundError()
+    def test_collect_invalid(self):
+        """Test collect with invalid repository."""
+        repo = make_repo()
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._is_git_repository()
+        result = repo.collect(
+            {
+                "status": make_process(b"", returncode=128),
+                "total_commits": make_process(b"", returncode=128),
+            }
+        )
 
         assert result is False
 
+    def test_collect_timeout(self):
+        """Test collect kills a git command that times out."""
+        proc = make_process()
+        proc.communicate.side_effect = [
+            subprocess.TimeoutExpired(["git"], 5),
+            (b"", None),
+        ]
+        repo = make_repo()
 
-class TestGitRepositoryBranch:
-    """Tests for branch information retrieval."""
-
-    @patch("subprocess.run")
-    def test_get_current_branch_success(self, mock_run):
-        """Test _get_current_branch with successful result."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "main\n"
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_branch()
-
-        assert result == "main"
-
-    @patch("subprocess.run")
-    def test_get_current_branch_detached_head(self, mock_run):
-        """Test _get_current_branch with detached HEAD."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = ""
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_branch()
-
-        assert result == "HEAD detached"
+        result = repo.collect({"status": proc})
 
-    @patch("subprocess.run")
-    def test_get_current_branch_error(self, mock_run):
-        """Test _get_current_branch with git error."""
-        mock_run.return_value.returncode = 1
+        assert result is False
+        proc.kill.assert_called_once()
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_branch()
+    def test_collect_total_commits_error(self):
+        """Test collect when counting commits fails (e.g. no commits yet)."""
+        repo = make_repo()
 
-        assert result == "Unknown"
+        result = repo.collect(
+            {
+                "status": make_process(STATUS_OUTPUT),
+                "total_commits": make_process(b"", returncode=128),
+            }
+        )
 
-    @patch("subprocess.run")
-    def test_get_current_branch_timeout(self, mock_run):
-        """Test _get_current_branch with timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired(["git"], 5)
+        assert result is True
+        assert repo.total_commits == 0
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_branch()
 
-        assert result == "Unknown"
+class TestGitRepositoryParseStatus:
+    """Tests for parsing the porcelain v2 status output."""
 
+    def test_parse_status_clean(self):
+        """Test _parse_status with a clean repository."""
+        repo = make_repo()
+        repo._parse_status(
+            b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+            b"# branch.head main\x00"
+            b"# branch.upstream origin/main\x00"
+            b"# branch.ab +0 -0\x00"
+        )
 
-class TestGitRepositoryRevision:
-    """Tests for revision information retrieval."""
+        assert repo.branch == "main"
+        assert repo.ahead_count == 0
+        assert repo.behind_count == 0
+        assert repo.changed_count == 0
+        assert repo.untracked_count == 0
 
-    @patch("subprocess.run")
-    def test_get_current_revision_success(self, mock_run):
-        """Test _get_current_branch with successful result."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "918e0c222f7ca5ea91794c0679cc414e03430bad\n"
+    def test_parse_status_detached_head(self):
+        """Test _parse_status with detached HEAD."""
+        repo = make_repo()
+        repo._parse_status(
+            b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+            b"# branch.head (detached)\x00"
+        )
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_revision()
+        assert repo.branch == "HEAD detached"
+        assert repo.rev == "918e0c222f7ca5ea91794c0679cc414e03430bad"
 
-        assert result == "918e0c222f7ca5ea91794c0679cc414e03430bad"
+    def test_parse_status_no_upstream(self):
+        """Test _parse_status without an upstream branch."""
+        repo = make_repo()
+        repo._parse_status(
+            b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+            b"# branch.head feature\x00"
+            b"? notes.txt\x00"
+        )
 
-    @patch("subprocess.run")
-    def test_get_current_revision_error(self, mock_run):
-        """Test _get_current_revision with git error."""
-        mock_run.return_value.returncode = 1
+        assert repo.branch == "feature"
+        assert repo.ahead_count == 0
+        assert repo.behind_count == 0
+        assert repo.changed_count == 1
+        assert repo.untracked_count == 1
+
+    def test_parse_status_special_file_names(self):
+        """Test _parse_status counts names with newlines and rename sources."""
+        repo = make_repo()
+        repo._parse_status(
+            b"# branch.oid 918e0c222f7ca5ea91794c0679cc414e03430bad\x00"
+            b"# branch.head main\x00"
+            b"1 .M N... 100644 100644 100644 abc123 abc123 multi\nline.txt\x00"
+            b"2 R. N... 100644 100644 100644 abc123 abc123 R100 new\x00? looks-new\x00"
+            b"? untracked.txt\x00"
+        )
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_revision()
+        assert repo.changed_count == 3
+        assert repo.untracked_count == 1
 
-        assert result == "Unknown"
+    def test_parse_status_initial_commit(self):
+        """Test _parse_status on a repository without commits."""
+        repo = make_repo()
+        repo._parse_status(b"# branch.oid (initial)\x00# branch.head main\x00")
 
-    @patch("subprocess.run")
-    def test_get_current_revision_timeout(self, mock_run):
-        """Test _get_current_revision with timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired(["git"], 5)
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_current_revision()
-
-        assert result == "Unknown"
+        assert repo.branch == "main"
+        assert repo.rev == "Unknown"
 
 
 class TestGitRepositoryRemote:
@@ -214,9 +349,9 @@ class TestGitRepositoryRemote:
     def test_get_remote_url_success(self, mock_run):
         """Test _get_remote_url with successful result."""
         mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "https://github.com/user/repo.git\n"
+        mock_run.return_value.stdout = b"https://github.com/user/repo.git\n"
 
-        repo = GitRepository("/path/to/repo")
+        repo = make_repo()
         result = repo._get_remote_url()
 
         assert result == "https://github.com/user/repo.git"
@@ -226,137 +361,69 @@ class TestGitRepositoryRemote:
         """Test _get_remote_url with no remote."""
         mock_run.return_value.returncode = 1
 
-        repo = GitRepository("/path/to/repo")
+        repo = make_repo()
         result = repo._get_remote_url()
 
         assert result == "No remote"
 
     @patch("subprocess.run")
-    def test_get_remote_url_timeout(self, mock_run):
-        """Test _get_remote_url with timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired(["git"], 5)
+    def test_get_remote_url_reads_config_file(self, mock_run, tmp_path):
+        """Test _get_remote_url reads .git/config without running git."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text(
+            '[remote "origin"]\n\turl = https://github.com/user/repo.git\n'
+        )
 
-        repo = GitRepository("/path/to/repo")
+        repo = make_repo(str(tmp_path))
         result = repo._get_remote_url()
 
-        assert result == "No remote"
-
-
-class TestGitRepositoryCommitCounts:
-    """Tests for commit count retrieval."""
-
-    @patch("git_tools.repository.subprocess.run")
-    def test_get_ahead_count_success(self, mock_run):
-        """Test _get_ahead_count with successful result."""
-        mock_run.side_effect = [
-            Mock(returncode=0, stdout="origin/main\n"),  # upstream check
-            Mock(returncode=0, stdout="3\n"),  # ahead count
-        ]
-
-        # Create repo instance without calling other methods
-        repo = GitRepository.__new__(GitRepository)
-        repo.path = Path("/path/to/repo")
-
-        result = repo._get_ahead_count()
-
-        assert result == 3
-
-    @patch("subprocess.run")
-    def test_get_ahead_count_no_upstream(self, mock_run):
-        """Test _get_ahead_count with no upstream branch."""
-        mock_run.return_value.returncode = 1
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_ahead_count()
-
-        assert result == 0
-
-    @patch("git_tools.repository.subprocess.run")
-    def test_get_behind_count_success(self, mock_run):
-        """Test _get_behind_count with successful result."""
-        mock_run.side_effect = [
-            Mock(returncode=0, stdout="origin/main\n"),  # upstream check
-            Mock(returncode=0, stdout="2\n"),  # behind count
-        ]
-
-        # Create repo instance without calling other methods
-        repo = GitRepository.__new__(GitRepository)
-        repo.path = Path("/path/to/repo")
-
-        result = repo._get_behind_count()
-
-        assert result == 2
-
-    @patch("subprocess.run")
-    def test_get_total_commits_success(self, mock_run):
-        """Test _get_total_commits with successful result."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "42\n"
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_total_commits()
-
-        assert result == 42
-
-    @patch("subprocess.run")
-    def test_get_total_commits_error(self, mock_run):
-        """Test _get_total_commits with git error."""
-        mock_run.return_value.returncode = 1
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_total_commits()
-
-        assert result == 0
-
+        assert result == "https://github.com/user/repo.git"
+        mock_run.assert_not_called()
 
-class TestGitRepositoryFileStatus:
-    """Tests for file status retrieval."""
+    def test_total_commits_is_lazy(self):
+        """Test total_commits is only counted on first access."""
+        repo = make_repo(count_commits=False)
+        repo.rev = "Unknown"
 
-    @patch("subprocess.run")
-    def test_get_changed_count_success(self, mock_run):
-        """Test _get_changed_count with files."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = " M file1.txt\n?? file2.txt\nA  file3.txt\n"
-
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_changed_count()
+        with patch.object(
+            GitRepository, "_spawn", return_value=make_process(b"42\n")
+        ) as mock_spawn:
+            assert repo.total_commits == 42
+            assert repo.total_commits == 42
 
-        assert result == 3
+        mock_spawn.assert_called_once_with(("rev-list", "--count", "HEAD"))
 
-    @patch("subprocess.run")
-    def test_get_changed_count_no_changes(self, mock_run):
-        """Test _get_changed_count with no changes."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = ""
+    def test_total_commits_lazy_failure(self):
+        """Test total_commits is 0 when git cannot count the commits."""
+        repo = make_repo(count_commits=False)
+        repo.rev = "Unknown"
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_changed_count()
-
-        assert result == 0
+        with patch.object(
+            GitRepository, "_spawn", return_value=make_process(b"", returncode=128)
+        ):
+            assert repo.total_commits == 0
 
-    @patch("subprocess.run")
-    def test_get_untracked_count_success(self, mock_run):
-        """Test _get_untracked_count with untracked files."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = (
-            " M file1.txt\n?? file2.txt\n?? file3.txt\nA  file4.txt\n"
-        )
+    def test_remote_url_is_lazy(self):
+        """Test remote_url is only looked up on first access."""
+        repo = make_repo()
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_untracked_count()
+        with patch.object(
+            GitRepository, "_get_remote_url", return_value="https://x/repo.git"
+        ) as mock_remote:
+            assert repo.remote_url == "https://x/repo.git"
+            assert repo.remote_url == "https://x/repo.git"
 
-        assert result == 2
+        mock_remote.assert_called_once()
 
     @patch("subprocess.run")
-    def test_get_untracked_count_no_untracked(self, mock_run):
-        """Test _get_untracked_count with no untracked files."""
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = " M file1.txt\nA  file2.txt\n"
+    def test_get_remote_url_timeout(self, mock_run):
+        """Test _get_remote_url with timeout."""
+        mock_run.side_effect = subprocess.TimeoutExpired(["git"], 5)
 
-        repo = GitRepository("/path/to/repo")
-        result = repo._get_untracked_count()
+        repo = make_repo()
+        result = repo._get_remote_url()
 
-        assert result == 0
+        assert result == "No remote"
 
 
 class TestGitRepositoryStatus:
@@ -2,10 +2,18 @@
 Unit tests for the GitScanner class.
 """
 
-from unittest.mock import patch, Mock
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import MagicMock, patch, Mock
 from pathlib import Path
 
+import pytest
+
 from git_tools import GitScanner
+from git_tools.scanner import DEFAULT_JOBS
 
 
 class TestGitScannerInit:
@@ -25,34 +33,62 @@ class TestGitScannerInit:
         assert scanner.scan_path == Path(custom_path).resolve()
         assert scanner.repositories == []
 
+    def test_init_default_jobs(self):
+        """Test initialization uses the default worker count."""
+        scanner = GitScanner()
+        assert scanner.jobs == DEFAULT_JOBS
+
+    def test_init_custom_jobs(self):
+        """Test initialization with custom worker count."""
+        assert GitScanner(jobs=3).jobs == 3
+        assert GitScanner(jobs=0).jobs == DEFAULT_JOBS
+
+
+def make_entry(name, is_dir=True):
+    """Create a mock os.DirEntry inside /path/to/scan."""
+    entry = Mock()
+    entry.name = name
+    entry.path = f"/path/to/scan/{name}"
+    entry.is_dir.return_value = is_dir
+    return entry
+
+
+def mock_scandir(entries=()):
+    """Create a mock os.scandir listing the given entries."""
+    scandir = MagicMock()
+    scandir.return_value.__enter__.return_value = iter(entries)
+    return scandir
+
 
 class TestGitScannerDirectoryCheck:
     """Tests for directory git repository checking."""
 
-    def test_is_directory_git_repo_true(self):
+    def test_is_directory_git_repo_true(self, tmp_path):
         """Test _is_directory_git_repo with git repository."""
+        (tmp_path / ".git").mkdir()
         scanner = GitScanner()
-        test_path = Path("/path/to/repo")
 
-        with patch.object(Path, "exists", return_value=True):
-            result = scanner._is_directory_git_repo(test_path)
+        assert scanner._is_directory_git_repo(tmp_path) is True
+        assert scanner._is_directory_git_repo(str(tmp_path)) is True
 
-        assert result is True
+    def test_is_directory_git_repo_git_file(self, tmp_path):
+        """Test _is_directory_git_repo with a .git file (worktree or submodule)."""
+        (tmp_path / ".git").write_text("gitdir: ../main/.git/worktrees/wt\n")
+        scanner = GitScanner()
+
+        assert scanner._is_directory_git_repo(tmp_path) is True
 
-    def test_is_directory_git_repo_false(self):
+    def test_is_directory_git_repo_false(self, tmp_path):
         """Test _is_directory_git_repo with non-git directory."""
         scanner = GitScanner()
-        test_path = Path("/path/to/non-repo")
 
-        with patch.object(Path, "exists", return_value=False):
-            result = scanner._is_directory_git_repo(test_path)
-
-        assert result is False
+        assert scanner._is_directory_git_repo(tmp_path) is False
 
 
 class TestGitScannerScan:
     """Tests for the scan method."""
 
+    @patch("git_tools.scanner.os.scandir", mock_scandir())
     @patch("git_tools.scanner.GitRepository")
     @patch("builtins.print")
     def test_scan_current_directory_is_repo(self, mock_print, mock_git_repo):
@@ -62,21 +98,20 @@ class TestGitScannerScan:
         mock_repo.is_valid = True
         mock_git_repo.return_value = mock_repo
 
-        # Mock the Path constructor to return a mock path that we can control
-        with patch("git_tools.scanner.Path") as mock_path_class:
-            mock_path_instance = Mock()
-            mock_path_instance.resolve.return_value = mock_path_instance
-            mock_path_instance.iterdir.return_value = []
-            mock_path_class.return_value = mock_path_instance
+        scanner = GitScanner("/path/to/repo")
 
-            scanner = GitScanner("/path/to/repo")
-
-            with patch.object(scanner, "_is_directory_git_repo", return_value=True):
-                result = scanner.scan()
+        with patch.object(scanner, "_is_directory_git_repo", return_value=True):
+            result = scanner.scan()
 
         assert len(result) == 1
         assert result[0] == mock_repo
         assert mock_repo in scanner.repositories
+        mock_git_repo.assert_called_once_with(
+            str(scanner.scan_path),
+            cache=None,
+            count_commits=False,
+            processes=scanner.processes,
+        )
         mock_print.assert_called_once_with(
             f"Scanning for Git repositories in: {scanner.scan_path}"
         )
@@ -85,22 +120,12 @@ class TestGitScannerScan:
     @patch("builtins.print")
     def test_scan_subdirectories(self, mock_print, mock_git_repo):
         """Test scan with subdirectories containing git repositories."""
-        # Mock subdirectories
-        mock_dir1 = Mock()
-        mock_dir1.is_dir.return_value = True
-        mock_dir1.name = "repo1"
-
-        mock_dir2 = Mock()
-        mock_dir2.is_dir.return_value = True
-        mock_dir2.name = "repo2"
-
-        mock_file = Mock()
-        mock_file.is_dir.return_value = False
-        mock_file.name = "file.txt"
-
-        mock_hidden_dir = Mock()
-        mock_hidden_dir.is_dir.return_value = True
-        mock_hidden_dir.name = ".hidden"
+        entries = [
+            make_entry("repo1"),
+            make_entry("repo2"),
+            make_entry("file.txt", is_dir=False),
+            make_entry(".hidden"),
+        ]
 
         # Mock repositories
         mock_repo1 = Mock()
@@ -110,20 +135,9 @@ class TestGitScannerScan:
 
         mock_git_repo.side_effect = [mock_repo1, mock_repo2]
 
-        # Mock the Path constructor to return a mock path that we can control
-        with patch("git_tools.scanner.Path") as mock_path_class:
-            mock_path_instance = Mock()
-            mock_path_instance.resolve.return_value = mock_path_instance
-            mock_path_instance.iterdir.return_value = [
-                mock_dir1,
-                mock_dir2,
-                mock_file,
-                mock_hidden_dir,
-            ]
-            mock_path_class.return_value = mock_path_instance
-
-            scanner = GitScanner("/path/to/scan")
+        scanner = GitScanner("/path/to/scan")
 
+        with patch("git_tools.scanner.os.scandir", mock_scandir(entries)):
             with patch.object(scanner, "_is_directory_git_repo") as mock_is_git_repo:
                 # Current directory is not a git repo
                 mock_is_git_repo.side_effect = [False, True, True]
@@ -138,84 +152,211 @@ class TestGitScannerScan:
         assert (
             mock_is_git_repo.call_count == 3
         )  # current dir + 2 subdirs (hidden dir and file are skipped)
+        assert [c.args[0] for c in mock_git_repo.call_args_list] == [
+            "/path/to/scan/repo1",
+            "/path/to/scan/repo2",
+        ]
 
     @patch("git_tools.scanner.GitRepository")
     @patch("builtins.print")
     def test_scan_invalid_repositories_filtered(self, mock_print, mock_git_repo):
         """Test scan filters out invalid repositories."""
-        # Mock subdirectory
-        mock_dir = Mock()
-        mock_dir.is_dir.return_value = True
-        mock_dir.name = "invalid-repo"
-
         # Mock invalid repository
         mock_repo = Mock()
         mock_repo.is_valid = False
         mock_git_repo.return_value = mock_repo
 
-        # Mock the Path constructor to return a mock path that we can control
-        with patch("git_tools.scanner.Path") as mock_path_class:
-            mock_path_instance = Mock()
-            mock_path_instance.resolve.return_value = mock_path_instance
-            mock_path_instance.iterdir.return_value = [mock_dir]
-            mock_path_class.return_value = mock_path_instance
-
-            scanner = GitScanner("/path/to/scan")
+        scanner = GitScanner("/path/to/scan")
 
+        with patch(
+            "git_tools.scanner.os.scandir", mock_scandir([make_entry("invalid-repo")])
+        ):
             with patch.object(scanner, "_is_directory_git_repo", return_value=True):
                 result = scanner.scan()
 
         assert len(result) == 0
         assert len(scanner.repositories) == 0
 
+    @patch("git_tools.scanner.os.scandir", side_effect=PermissionError())
     @patch("builtins.print")
-    def test_scan_permission_error(self, mock_print):
+    def test_scan_permission_error(self, mock_print, mock_scandir_call):
         """Test scan handles permission errors gracefully."""
-        # Mock the Path constructor to return a mock path that we can control
-        with patch("git_tools.scanner.Path") as mock_path_class:
-            mock_path_instance = Mock()
-            mock_path_instance.resolve.return_value = mock_path_instance
-            mock_path_instance.iterdir.side_effect = PermissionError()
-            mock_path_class.return_value = mock_path_instance
-
-            scanner = GitScanner("/path/to/restricted")
+        scanner = GitScanner("/path/to/restricted")
 
-            with patch.object(scanner, "_is_directory_git_repo", return_value=False):
-                result = scanner.scan()
+        with patch.object(scanner, "_is_directory_git_repo", return_value=False):
+            result = scanner.scan()
 
         assert len(result) == 0
         mock_print.assert_any_call(f"Permission denied accessing: {scanner.scan_path}")
 
+    @patch("git_tools.scanner.os.scandir", mock_scandir())
     @patch("git_tools.scanner.GitRepository")
     @patch("builtins.print")
     def test_scan_empty_directory(self, mock_print, mock_git_repo):
         """Test scan with empty directory."""
-        # Mock the Path constructor to return a mock path that we can control
-        with patch("git_tools.scanner.Path") as mock_path_class:
-            mock_path_instance = Mock()
-            mock_path_instance.resolve.return_value = mock_path_instance
-            mock_path_instance.iterdir.return_value = []
-            mock_path_class.return_value = mock_path_instance
-
-            scanner = GitScanner("/path/to/empty")
+        scanner = GitScanner("/path/to/empty")
 
-            with patch.object(scanner, "_is_directory_git_repo", return_value=False):
-                result = scanner.scan()
+        with patch.object(scanner, "_is_directory_git_repo", return_value=False):
+            result = scanner.scan()
 
         assert len(result) == 0
         assert len(scanner.repositories) == 0
 
+    def test_scan_real_directory(self, tmp_path):
+        """Test scan finds repositories, following symlinked directories."""
+        for name in ("repo", ".hidden", "plain"):
+            (tmp_path / name).mkdir()
+        (tmp_path / "repo" / ".git").mkdir()
+        (tmp_path / ".hidden" / ".git").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "repo")
+
+        scanner = GitScanner(str(tmp_path))
+        with patch("git_tools.scanner.GitRepository") as mock_git_repo, patch(
+            "builtins.print"
+        ):
+            scanner.scan()
+
+        assert sorted(c.args[0] for c in mock_git_repo.call_args_list) == [
+            str(tmp_path / "link"),
+            str(tmp_path / "repo"),
+        ]
+
+    @pytest.mark.skipif(os.name == "nt", reason="uses a shell script as git")
+    def test_scan_deadline_ends_the_process(self, tmp_path):
+        """Test the process exits at the deadline, not when git finishes."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        git = bin_dir / "git"
+        git.write_text("#!/bin/sh\nexec sleep 10\n")
+        git.chmod(0o755)
+        (tmp_path / "scan" / "slow" / ".git").mkdir(parents=True)
+        script = (
+            "from git_tools import GitScanner\n"
+            f"scanner = GitScanner({str(tmp_path / 'scan')!r}, deadline=0.5)\n"
+            "scanner.scan()\n"
+            "print([path.name for path in scanner.timed_out])\n"
+        )
+        env = dict(
+            os.environ,
+            PATH=os.pathsep.join([str(bin_dir), os.environ.get("PATH", "")]),
+            PYTHONPATH=os.pathsep.join(sys.path),
+        )
+
+        started = time.monotonic()
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=30,
+            check=False,
+        )
+        elapsed = time.monotonic() - started
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.endswith("['slow']\n")
+        assert elapsed < 5
+
+    @patch("git_tools.scanner.os.scandir", mock_scandir())
+    @patch("git_tools.scanner.ThreadPoolExecutor")
+    @patch("git_tools.scanner.GitRepository")
+    @patch("builtins.print")
+    def test_scan_uses_thread_pool(self, mock_print, mock_git_repo, mock_executor):
+        """Test scan inspects candidates through a pool sized by jobs."""
+        mock_repo = Mock()
+        mock_repo.is_valid = True
+        executor = mock_executor.return_value
+        executor.submit.return_value.result.return_value = mock_repo
+
+        scanner = GitScanner("/path/to/repo", jobs=5)
+        scanner.processes = Mock()
+
+        with patch.object(scanner, "_is_directory_git_repo", return_value=True):
+            result = scanner.scan()
+
+        assert result == [mock_repo]
+        mock_executor.assert_called_once_with(max_workers=5)
+        executor.submit.assert_called_once()
+        executor.submit.return_value.result.assert_called_once_with(timeout=None)
+        scanner.processes.kill.assert_not_called()
+        executor.shutdown.assert_called_once_with(wait=True)
+
+    @patch("git_tools.scanner.ThreadPoolExecutor")
+    @patch("git_tools.scanner.GitRepository")
+    @patch("builtins.print")
+    def test_scan_deadline_returns_partial_results(
+        self, mock_print, mock_git_repo, mock_executor
+    ):
+        """Test scan gives up on repositories not inspected before the deadline."""
+        done_repo = Mock()
+        done_repo.is_valid = True
+        done = Mock()
+        done.result.return_value = done_repo
+        pending = Mock()
+        pending.result.side_effect = FutureTimeoutError()
+        executor = mock_executor.return_value
+        executor.submit.side_effect = [done, pending]
+
+        scanner = GitScanner("/path/to/scan", deadline=1.5)
+        scanner.processes = Mock()
+
+        with patch("git_tools.scanner.os.scandir", mock_scandir([make_entry("slow")])):
+            with patch.object(scanner, "_is_directory_git_repo", return_value=True):
+                result = scanner.scan()
+
+        assert result == [done_repo]
+        assert scanner.timed_out == [Path("/path/to/scan/slow")]
+        timeout = done.result.call_args.kwargs["timeout"]
+        assert 0 <= timeout <= 1.5
+        pending.cancel.assert_called_once()
+        scanner.processes.kill.assert_called_once()
+        executor.shutdown.assert_called_once_with(wait=False)
+
+    @patch("git_tools.scanner.os.scandir", mock_scandir())
+    @patch("git_tools.scanner.GitRepository")
+    @patch("builtins.print")
+    def test_scan_shares_cache(self, mock_print, mock_git_repo):
+        """Test scan hands the cache to every repository and saves it once."""
+        mock_git_repo.return_value.is_valid = True
+        cache = Mock()
+
+        scanner = GitScanner("/path/to/repo", cache=cache, count_commits=True)
+
+        with patch.object(scanner, "_is_directory_git_repo", return_value=True):
+            scanner.scan()
+
+        mock_git_repo.assert_called_once_with(
+            str(scanner.scan_path),
+            cache=cache,
+            count_commits=True,
+            processes=scanner.processes,
+        )
+        cache.save.assert_called_once()
+
+    @patch("git_tools.scanner.os.scandir", mock_scandir())
+    @patch("git_tools.scanner.ThreadPoolExecutor")
+    @patch("builtins.print")
+    def test_scan_no_candidates_skips_pool(self, mock_print, mock_executor):
+        """Test scan does not start a pool when nothing looks like a repository."""
+        scanner = GitScanner("/path/to/empty")
+
+        with patch.object(scanner, "_is_directory_git_repo", return_value=False):
+            result = scanner.scan()
+
+        assert result == []
+        mock_executor.assert_not_called()
+        assert scanner.timed_out == []
+
 
 class TestGitScannerRepositoryFiltering:
     """Tests for repository filtering methods."""
 
-    def test_get_repositories_with_changes(self):
+    def test_get_repositories_with_changes(self, loose_repo):
         """Test get_repositories_with_changes method."""
         scanner = GitScanner()
 
         # Create mock repositories
-        clean_repo = Mock()
-        clean_repo.has_changes.return_value = False
+        clean_repo = loose_repo
 
         dirty_repo = Mock()
         dirty_repo.has_changes.return_value = True
@@ -245,16 +386,12 @@ class TestGitScannerRepositoryFiltering:
 class TestGitScannerSummaryStats:
     """Tests for summary statistics generation."""
 
-    def test_get_summary_stats_mixed_repositories(self):
+    def test_get_summary_stats_mixed_repositories(self, loose_repo):
         """Test get_summary_stats with mixed repository states."""
         scanner = GitScanner()
 
         # Create mock repositories with different states
-        clean_repo = Mock()
-        clean_repo.changed_count = 0
-        clean_repo.ahead_count = 0
-        clean_repo.behind_count = 0
-        clean_repo.untracked_count = 0
+        clean_repo = loose_repo
 
         dirty_repo = Mock()
         dirty_repo.changed_count = 3
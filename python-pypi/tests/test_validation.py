@@ -3,55 +3,63 @@ Unit tests for the validation utility functions.
 """
 
 import pytest
-from unittest.mock import patch, Mock
-import subprocess
+from unittest.mock import patch
+import os
 import sys
 from pathlib import Path
 
 from utils import check_git_availability, validate_path
+from utils.validation import _find_git
 
 
 class TestCheckGitAvailability:
     """Tests for check_git_availability function."""
 
-    @patch("subprocess.run")
-    def test_check_git_availability_success(self, mock_run):
+    @patch("utils.validation.os.access", return_value=True)
+    @patch("utils.validation.GIT", "/usr/bin/git")
+    def test_check_git_availability_success(self, mock_access):
         """Test check_git_availability when git is available."""
-        mock_run.return_value = Mock()
-
         result = check_git_availability()
 
         assert result is True
-        mock_run.assert_called_once_with(
-            ["git", "--version"], capture_output=True, check=True
-        )
+        mock_access.assert_called_once_with("/usr/bin/git", os.X_OK)
 
     @patch("subprocess.run")
-    def test_check_git_availability_subprocess_error(self, mock_run):
-        """Test check_git_availability with subprocess error."""
-        mock_run.side_effect = subprocess.SubprocessError()
+    @patch("utils.validation.GIT", "/usr/bin/git")
+    def test_check_git_availability_runs_no_subprocess(self, mock_run):
+        """Test check_git_availability does not start git."""
+        with patch("utils.validation.os.access", return_value=True):
+            check_git_availability()
 
+        mock_run.assert_not_called()
+
+    @patch("utils.validation.GIT", "git")
+    def test_check_git_availability_not_found(self):
+        """Test check_git_availability when git is not on PATH."""
         result = check_git_availability()
 
         assert result is False
 
-    @patch("subprocess.run")
-    def test_check_git_availability_file_not_found(self, mock_run):
-        """Test check_git_availability when git is not found."""
-        mock_run.side_effect = FileNotFoundError()
-
+    @patch("utils.validation.os.access", return_value=False)
+    @patch("utils.validation.GIT", "/usr/bin/git")
+    def test_check_git_availability_not_executable(self, mock_access):
+        """Test check_git_availability when git cannot be executed."""
         result = check_git_availability()
 
         assert result is False
 
-    @patch("subprocess.run")
-    def test_check_git_availability_called_process_error(self, mock_run):
-        """Test check_git_availability with CalledProcessError."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, ["git", "--version"])
+    @patch("utils.validation.shutil.which", return_value=os.path.join("bin", "git"))
+    def test_find_git_resolves_relative_path(self, mock_which):
+        """Test a git found through a relative PATH entry is made absolute."""
+        result = _find_git()
 
-        result = check_git_availability()
+        assert result == os.path.abspath(os.path.join("bin", "git"))
+        assert os.path.isabs(result)
 
-        assert result is False
+    @patch("utils.validation.shutil.which", return_value=None)
+    def test_find_git_not_found(self, mock_which):
+        """Test _find_git falls back to the bare name when git is not on PATH."""
+        assert _find_git() == "git"
 
 
 class TestValidatePath:
@@ -154,11 +162,10 @@ class TestValidationIntegration:
     """Integration tests for validation functions."""
 
     def test_check_git_availability_real_call(self):
-        """Test check_git_availability with real subprocess call."""
+        """Test check_git_availability with the resolved git executable."""
         # This test depends on git being available in the test environment
-        # We'll mock it to avoid dependency on actual git installation
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock()
+        # We'll mock the lookup to avoid dependency on actual git installation
+        with patch("utils.validation.GIT", sys.executable):
             result = check_git_availability()
             assert result is True
 